@@ -0,0 +1,146 @@
+"""
+Compares fetching a chapter's pages over HTTP/1.1 with fetching them over
+the shared HTTP/2 transport, against local servers that add a fixed delay
+per new connection (TCP+TLS handshake) and per request (round trip).
+
+Needs the optional `httpx[http2]` package:
+    poetry run pip install "httpx[http2]"
+    poetry run python scripts/bench_http2.py
+"""
+import sys
+import argparse
+import threading
+import socketserver
+from time import sleep, perf_counter
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+import requests
+import h2.config
+import h2.events
+import h2.connection
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from core.__seedwork.infra.http.http.http2 import Http2Session
+
+HANDSHAKE = 0.06
+RTT = 0.03
+
+class Http1Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    payload = b''
+
+    def setup(self):
+        sleep(HANDSHAKE)
+        super().setup()
+
+    def do_GET(self):
+        sleep(RTT)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, *args):
+        pass
+
+class Http2Handler(socketserver.BaseRequestHandler):
+    payload = b''
+
+    def handle(self):
+        sleep(HANDSHAKE)
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        lock = threading.Lock()
+        conn.initiate_connection()
+        self.request.sendall(conn.data_to_send())
+
+        def respond(stream_id):
+            sleep(RTT)
+            with lock:
+                conn.send_headers(stream_id, [(':status', '200'), ('content-type', 'image/jpeg'), ('content-length', str(len(self.payload)))])
+                size = conn.max_outbound_frame_size
+                for i in range(0, len(self.payload), size):
+                    chunk = self.payload[i:i + size]
+                    conn.send_data(stream_id, chunk, end_stream=i + size >= len(self.payload))
+                self.request.sendall(conn.data_to_send())
+
+        while True:
+            try:
+                data = self.request.recv(65535)
+            except OSError:
+                return
+            if not data:
+                return
+            with lock:
+                events = conn.receive_data(data)
+                self.request.sendall(conn.data_to_send())
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    threading.Thread(target=respond, args=(event.stream_id,), daemon=True).start()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+class Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve(handler) -> tuple[Server, int]:
+    server = Server(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+def fetch_all(fetch, urls, workers) -> float:
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sizes = list(executor.map(fetch, urls))
+    assert all(sizes), 'empty response'
+    return perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=60)
+    parser.add_argument('--size', type=int, default=300 * 1024)
+    parser.add_argument('--workers', type=int, default=12)
+    args = parser.parse_args()
+
+    Http1Handler.payload = Http2Handler.payload = b'\xff' * args.size
+    http1, http1_port = serve(Http1Handler)
+    http2, http2_port = serve(Http2Handler)
+
+    http1_urls = [f'http://127.0.0.1:{http1_port}/{i}.jpg' for i in range(args.pages)]
+    http2_urls = [f'http://127.0.0.1:{http2_port}/{i}.jpg' for i in range(args.pages)]
+
+    def new_session_per_request(url):
+        with requests.Session() as session:
+            return len(session.get(url).content)
+
+    local = threading.local()
+    def session_per_worker(url):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return len(local.session.get(url).content)
+
+    shared = Http2Session(prior_knowledge=True)
+    def multiplexed(url):
+        return len(shared.get(url).content)
+
+    results = [
+        ('HTTP/1.1, new session per request', fetch_all(new_session_per_request, http1_urls, args.workers)),
+        ('HTTP/1.1, session per worker', fetch_all(session_per_worker, http1_urls, args.workers)),
+        ('HTTP/2, one multiplexed connection', fetch_all(multiplexed, http2_urls, args.workers)),
+    ]
+
+    print(f'{args.pages} pages of {args.size // 1024} KB, {args.workers} workers, '
+          f'{int(HANDSHAKE * 1000)} ms handshake, {int(RTT * 1000)} ms round trip')
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f'{name:<38} {elapsed:6.2f}s  {baseline / elapsed:5.2f}x')
+
+    shared.close()
+    http1.shutdown()
+    http2.shutdown()
+
+if __name__ == '__main__':
+    main()
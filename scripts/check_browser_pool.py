@@ -0,0 +1,57 @@
+"""
+Runs the no-captcha Cloudflare bypass against a local page that imitates a
+challenge: without the clearance cookie it answers 403 "Just a moment..."
+and sets the cookie from JavaScript after a second, like the real one.
+The first call starts Chrome, the following ones borrow a tab from the
+pooled browser and find the cookie already in its profile.
+
+    poetry run python scripts/check_browser_pool.py
+"""
+import sys
+import threading
+from time import perf_counter
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from core.config.request_data import delete_request
+from core.__seedwork.infra.utils.domain import get_domain
+from core.cloudflare.infra.nodriver.browser_pool import browser_pool
+from core.cloudflare.application.use_cases import BypassCloudflareNoCapchaUseCase
+
+CHALLENGE = b'''<html><head><title>Just a moment...</title></head><body>
+<script>setTimeout(() => { document.cookie = "cf_clearance=local; path=/"; location.reload(); }, 1000);</script>
+</body></html>'''
+CONTENT = b'<html><head><title>Chapter</title></head><body><img src="/001.jpg"></body></html>'
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        cleared = 'cf_clearance=local' in self.headers.get('Cookie', '')
+        body = CONTENT if cleared else CHALLENGE
+        self.send_response(200 if cleared else 403)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    server = ThreadingHTTPServer(('localhost', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://localhost:{server.server_address[1]}/chapter'
+
+    try:
+        for i in range(3):
+            start = perf_counter()
+            content = BypassCloudflareNoCapchaUseCase().execute(url)
+            assert content and 'Chapter' in content, 'challenge was not solved'
+            print(f'call {i + 1}: {perf_counter() - start:.2f}s')
+    finally:
+        delete_request(get_domain(url))
+        browser_pool.close()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -306,6 +306,23 @@ class Ui_MainWindow(object):
 
         self.horizontalLayout_9.addLayout(self.verticalLayout_9)
 
+        self.verticalLayout_22 = QVBoxLayout()
+        self.verticalLayout_22.setObjectName(u"verticalLayout_22")
+        self.bandwidth_label = QLabel(self.scrollAreaWidgetContents_2)
+        self.bandwidth_label.setObjectName(u"bandwidth_label")
+
+        self.verticalLayout_22.addWidget(self.bandwidth_label)
+
+        self.bandwidth_qtd = QSpinBox(self.scrollAreaWidgetContents_2)
+        self.bandwidth_qtd.setObjectName(u"bandwidth_qtd")
+        self.bandwidth_qtd.setMaximum(1000000)
+        self.bandwidth_qtd.setSingleStep(100)
+
+        self.verticalLayout_22.addWidget(self.bandwidth_qtd)
+
+
+        self.horizontalLayout_9.addLayout(self.verticalLayout_22)
+
 
         self.verticalLayout_2.addLayout(self.horizontalLayout_9)
 
@@ -621,6 +638,9 @@ class Ui_MainWindow(object):
         self.format_img.setItemText(3, QCoreApplication.translate("MainWindow", u".avif", None))
 
         self.simul_label.setText(QCoreApplication.translate("MainWindow", u"Downloads simult\u00e2neos:", None))
+        self.bandwidth_label.setText(QCoreApplication.translate("MainWindow", u"Limite de banda:", None))
+        self.bandwidth_qtd.setSpecialValueText(QCoreApplication.translate("MainWindow", u"Sem limite", None))
+        self.bandwidth_qtd.setSuffix(QCoreApplication.translate("MainWindow", u" KB/s", None))
         self.path_label.setText(QCoreApplication.translate("MainWindow", u"Defina o caminho dos arquivos:", None))
         self.open_folder.setText(QCoreApplication.translate("MainWindow", u"Abrir a pasta", None))
         self.setSaveFolder.setText(QCoreApplication.translate("MainWindow", u"...", None))
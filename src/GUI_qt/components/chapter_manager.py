@@ -5,18 +5,19 @@ from typing import List
 from PyQt6 import uic
 from PyQt6.QtWidgets import QSpacerItem, QSizePolicy
 from core.providers.domain.entities import Chapter
+from core.__seedwork.infra.log import log
 from GUI_qt.utils.config import get_config
 from GUI_qt.utils.paths import paths
 
 
 def log_info(message):
-    print(f"[INFO] {message}")
+    log.info(f"[INFO] {message}")
 
 def log_error(message):
-    print(f"[ERROR] {message}")
+    log.error(f"[ERROR] {message}")
 
 def log_success(message):
-    print(f"[SUCCESS] {message}")
+    log.info(f"[SUCCESS] {message}")
 
 
 class ChapterManager:
@@ -74,7 +75,7 @@ class ChapterManager:
 
         except ValueError as e:
             log_error(f"Erro no filtro de capítulos: {e}")
-            print(f"Error: {e}")
+            log.error(f"Error: {e}")
             self.chapters = []
 
         self._add_chapters()
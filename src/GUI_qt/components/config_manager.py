@@ -195,6 +195,8 @@ class ConfigManager:
             translation['open_folder'])
         self.parent_window.path_label.setText(translation['path_label'])
         self.parent_window.simul_label.setText(translation['download_qtd'])
+        self.parent_window.bandwidth_label.setText(translation['bandwidth'])
+        self.parent_window.bandwidth_qtd.setSpecialValueText(translation['unlimited'])
         self.parent_window.dev_label.setText(translation['dev_label'])
         self.parent_window.dev_check.setText(translation['dev_check'])
         self.parent_window.group_imgs.setTitle(translation['group_images'])
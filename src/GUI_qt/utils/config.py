@@ -16,6 +16,7 @@ class Config:
     log: bool = False
     external_provider: bool = False
     external_provider_path: str | None = None
+    bandwidth: int = 0
 
     def as_dict(self):
         return asdict(self)
@@ -51,13 +52,14 @@ def init_db():
 
     add_field_if_not_exists('external_provider_path')
     add_field_if_not_exists('external_provider', 'INTEGER', 0)
+    add_field_if_not_exists('bandwidth', 'INTEGER', 0)
 
 def init(lang: str) -> None:
     init_db()
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
-    cursor.execute('INSERT INTO config VALUES (?, ?, ?, ?, ?, ?)',
-                   (lang, 0, 3, 0, None, 0))
+    cursor.execute('INSERT INTO config VALUES (?, ?, ?, ?, ?, ?, ?)',
+                   (lang, 0, 3, 0, None, 0, 0))
     conn.commit()
     conn.close()
 
@@ -70,7 +72,7 @@ def get_config() -> Config | None:
     conn.close()
     if row is None:
         return None
-    return Config(lang=row[0], progress=bool(row[1]), max_download=row[2], log=bool(row[3]), external_provider_path=row[4], external_provider=row[5])
+    return Config(lang=row[0], progress=bool(row[1]), max_download=row[2], log=bool(row[3]), external_provider_path=row[4], external_provider=row[5], bandwidth=row[6] or 0)
 
 def update_config_field(field: str, value):
     conn = sqlite3.connect(db_path)
@@ -82,6 +84,9 @@ def update_config_field(field: str, value):
 def update_max_download(max_download: int):
     update_config_field('max_download', max_download)
 
+def update_bandwidth(bandwidth: int):
+    update_config_field('bandwidth', bandwidth)
+
 def update_progress(progress: bool):
     update_config_field('progress', progress)
 
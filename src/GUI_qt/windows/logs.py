@@ -1,25 +1,18 @@
 import os
 import sys
+from collections import deque
 from PyQt6.QtGui import QIcon
 from PyQt6.QtGui import QTextCursor
 from GUI_qt.utils.paths import paths
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton
+from core.__seedwork.infra.log import log, Level, MAX_LINES
 
 current_dir = str(paths.gui_dir)
 assets = os.path.join(current_dir, 'assets')
 
-class LogEmitter(QObject):
-    log_signal = pyqtSignal(str)
-
-class LogThread(QThread):
-    def __init__(self, emitter):
-        super().__init__()
-        self.emitter = emitter
-
-    def run(self):
-        sys.stdout = EmittingStream(self.emitter.log_signal)
-        sys.stderr = EmittingStream(self.emitter.log_signal)
+# How often the window appends what the log pipeline delivered, in ms
+RENDER_INTERVAL = 250
 
 class LogWindow(QWidget):
     def __init__(self):
@@ -32,13 +25,20 @@ class LogWindow(QWidget):
         self.layout = QVBoxLayout(self)
         self.log_output = QTextEdit(self)
         self.log_output.setReadOnly(True)
+        # Oldest lines are dropped by the document itself
+        self.log_output.document().setMaximumBlockCount(MAX_LINES)
         self.layout.addWidget(self.log_output)
 
-        self.emitter = LogEmitter()
-        self.emitter.log_signal.connect(self.write_log)
+        # Filled by the log flush thread, emptied by the GUI thread
+        self.pending = deque(maxlen=MAX_LINES)
+        self.sink = self.pending.extend
+        log.add_sink(self.sink)
+        sys.stdout = EmittingStream(Level.INFO)
+        sys.stderr = EmittingStream(Level.ERROR)
 
-        self.log_thread = LogThread(self.emitter)
-        self.log_thread.start()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.render_pending)
+        self.timer.start(RENDER_INTERVAL)
 
         self.clear_button = QPushButton("Clear Logs")
         self.clear_button.clicked.connect(self.clear_logs)
@@ -46,34 +46,54 @@ class LogWindow(QWidget):
 
         self.scroll_at_bottom = True
         self.log_output.verticalScrollBar().valueChanged.connect(self.check_scroll_position)
-    
+
+    def detach(self):
+        self.timer.stop()
+        log.remove_sink(self.sink)
+
     def clear_logs(self):
         self.log_output.clear()
 
-    def write_log(self, text: str):
-        if "[no-render]" in text:
-            self.log_output.append(text)
-        else:
-            text = text + '<br>'
-            self.log_output.insertHtml(text)
+    def render_pending(self):
+        if not self.pending:
+            return
+        records = []
+        while self.pending:
+            records.append(self.pending.popleft())
+
+        # One edit block per batch, so the document is laid out once
+        cursor = QTextCursor(self.log_output.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for record in records:
+            if not self.log_output.document().isEmpty():
+                cursor.insertBlock()
+            if "[no-render]" in record.message:
+                cursor.insertText(record.message)
+            else:
+                cursor.insertHtml(record.message)
+        cursor.endEditBlock()
+
         if self.scroll_at_bottom:
             self.log_output.moveCursor(QTextCursor.MoveOperation.End)
-    
+
     def check_scroll_position(self):
         max_value = self.log_output.verticalScrollBar().maximum()
         current_value = self.log_output.verticalScrollBar().value()
-        
+
         margin = 10
-        
+
         self.scroll_at_bottom = (current_value >= max_value - margin)
 
 class EmittingStream:
-    def __init__(self, signal):
-        self.signal = signal
+    """Sends what is still printed (providers, third-party libraries) into the log pipeline."""
+
+    def __init__(self, level: Level):
+        self.level = level
 
     def write(self, text):
         if text.strip():
-            self.signal.emit(text)
+            log.log(self.level, text.rstrip('\n'))
 
     def flush(self):
-        pass
\ No newline at end of file
+        pass
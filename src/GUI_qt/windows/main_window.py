@@ -5,9 +5,13 @@ import subprocess
 from PyQt6 import uic
 from PyQt6.QtCore import QThreadPool
 from PyQt6.QtWidgets import QApplication, QMessageBox
-from tldextract import extract
+from core.__seedwork.infra.utils.domain import get_host
+from core.__seedwork.infra.http.http.bandwidth import bandwidth_shaper
+from core.__seedwork.infra.http.http.telemetry import telemetry, GuiLogSink, JsonlSink
+from core.__seedwork.infra.log import log, FileSink
+from platformdirs import user_log_dir
 from clipman import get
-from GUI_qt.utils.config import get_config, update_max_download, update_log, update_progress
+from GUI_qt.utils.config import get_config, update_max_download, update_bandwidth, update_log, update_progress
 from GUI_qt.utils.load_providers import import_classes_recursively
 from GUI_qt.utils.paths import paths
 from GUI_qt.workers.manga_worker import MangaTask, ChaptersTask
@@ -42,10 +46,12 @@ class MangaDownloaderMainWindow:
         self.login_manager_window = None
         self.log_window = None
         self.init_log = False
+        self.timing_sink = GuiLogSink()
 
         conf = get_config()
         self.pool = QThreadPool.globalInstance()
         self.pool.setMaxThreadCount(conf.max_download)
+        bandwidth_shaper.set_rate(conf.bandwidth * 1024)
         self.pool2 = QThreadPool()
         self.pool2.setMaxThreadCount(1)
 
@@ -62,6 +68,7 @@ class MangaDownloaderMainWindow:
     def _setup_ui(self):
         self.window.progress_scroll.hide()
         self.window.simul_qtd.wheelEvent = lambda event: event.ignore()
+        self.window.bandwidth_qtd.wheelEvent = lambda event: event.ignore()
 
         conf = get_config()
         if not conf.log and os.environ.get('RYUJINAPPENV') != 'dev':
@@ -70,11 +77,19 @@ class MangaDownloaderMainWindow:
             self.init_log = True
             self.window.dev_check.setChecked(True)
             self.log_window = LogWindow()
+            telemetry.add_sink(self.timing_sink)
+
+        log_path = user_log_dir('RyujinApp')
+        os.makedirs(log_path, exist_ok=True)
+        log.add_sink(FileSink(os.path.join(log_path, 'ryujin.log')))
+        if os.environ.get('RYUJINAPPENV') == 'dev':
+            telemetry.add_sink(JsonlSink(os.path.join(log_path, 'requests.jsonl')))
 
         if conf.progress:
             self.window.progress_scroll.show()
 
         self.window.simul_qtd.setValue(conf.max_download)
+        self.window.bandwidth_qtd.setValue(conf.bandwidth)
 
     def _connect_signals(self):
         self.window.logs.clicked.connect(self.open_log_window)
@@ -98,6 +113,7 @@ class MangaDownloaderMainWindow:
         self.window.search.textChanged.connect(
             self.chapter_manager.filter_chapters)
         self.window.simul_qtd.textChanged.connect(self.set_max_download)
+        self.window.bandwidth_qtd.valueChanged.connect(self.set_bandwidth)
         self.window.langs.currentTextChanged.connect(
             self.config_manager.lang_changed)
         self.window.langs.wheelEvent = lambda event: event.ignore()
@@ -156,7 +172,7 @@ class MangaDownloaderMainWindow:
                 scrollbar.setValue(scroll_value)
             self.progress_manager.add_download(chapter, self.provider_selected)
         except Exception as e:
-            print(f"Error in chapter download button clicked: {e}")
+            log.error(f"Error in chapter download button clicked: {e}")
 
     def set_chapter(self, chapters):
         self.chapter_manager.set_chapters(chapters)
@@ -167,7 +183,7 @@ class MangaDownloaderMainWindow:
             manga_id = getattr(manga, 'id', None)
             if not manga_id:
                 error_msg = f"[ERROR] O manga retornado não possui um ID válido. Provider: {self.provider_selected.name}"
-                print(error_msg)
+                log.error(error_msg)
                 self._manga_by_link_error("O manga retornado não possui um ID válido. Verifique o link ou o provider.")
                 return
             
@@ -177,7 +193,7 @@ class MangaDownloaderMainWindow:
             manga_name = getattr(manga, "name", "Sem nome")
             if not manga_name or not isinstance(manga_name, str):
                 manga_name = "Sem nome"
-                print(f"[ERROR] Nome do manga inválido. Provider: {self.provider_selected.name}")
+                log.error(f"[ERROR] Nome do manga inválido. Provider: {self.provider_selected.name}")
             
             self.window.setWindowTitle(f'RyujinApp | {manga_name} | {self.provider_selected.name}')
             
@@ -188,7 +204,7 @@ class MangaDownloaderMainWindow:
             
         except Exception as e:
             error_msg = f"[ERROR] Erro ao processar manga: {str(e)}"
-            print(error_msg)
+            log.error(error_msg)
             self._manga_by_link_error(f"Erro ao processar manga: {str(e)}")
 
     def _manga_by_link_error(self, msg: str):
@@ -197,12 +213,7 @@ class MangaDownloaderMainWindow:
 
     def manga_by_link(self):
         link = get()
-        extract_info = extract(link)
-
-        if extract_info.subdomain:
-            domain = f"{extract_info.subdomain}.{extract_info.domain}.{extract_info.suffix}"
-        else:
-            domain = f"{extract_info.domain}.{extract_info.suffix}"
+        domain = get_host(link)
 
         provider_found = False
 
@@ -268,6 +279,10 @@ class MangaDownloaderMainWindow:
         update_max_download(max_qtd)
         self.pool.setMaxThreadCount(max_qtd)
 
+    def set_bandwidth(self, kbps: int):
+        update_bandwidth(kbps)
+        bandwidth_shaper.set_rate(kbps * 1024)
+
     def set_slicer_height(self):
         slicer_height = int(self.window.slicer_height.text())
         update_split_height(slicer_height)
@@ -311,10 +326,13 @@ class MangaDownloaderMainWindow:
             if self.window.logs.isHidden():
                 self.window.logs.show()
                 self.log_window = LogWindow()
+                telemetry.add_sink(self.timing_sink)
                 update_log(True)
             else:
                 self.window.logs.hide()
+                self.log_window.detach()
                 self.log_window = None
+                telemetry.remove_sink(self.timing_sink)
                 update_log(False)
         else:
             self.init_log = False
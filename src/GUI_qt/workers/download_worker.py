@@ -2,6 +2,9 @@ import os
 from PyQt6.QtCore import QRunnable, pyqtSignal, QObject
 from core.config.img_conf import get_config as get_img_config
 from core.config.login_data import delete_login
+from core.__seedwork.infra.log import log
+from core.__seedwork.infra.http.http.circuit_breaker import CircuitOpenError
+from core.cloudflare.infra.clearance import clearance_refresher
 from core.providers.application.use_cases import ProviderGetPagesUseCase, ProviderDownloadUseCase
 from core.slicer.application.use_cases import SlicerUseCase
 from core.group_imgs.application.use_cases import GroupImgsUseCase
@@ -11,13 +14,13 @@ import json
 
 
 def log_info(message):
-    print(f"[INFO] {message}")
+    log.info(f"[INFO] {message}")
 
 def log_error(message):
-    print(f"[ERROR] {message}")
+    log.error(f"[ERROR] {message}")
 
 def log_success(message):
-    print(f"[SUCCESS] {message}")
+    log.info(f"[SUCCESS] {message}")
 
 
 class DownloadWorkerSignals(QObject):
@@ -37,6 +40,11 @@ class DownloadWorker(QRunnable):
         self.assets = os.path.join(self.current_dir, 'assets')
 
     def run(self):
+        # Keeps the provider's Cloudflare clearance fresh while the chapter downloads
+        with clearance_refresher.active(self.provider.domain):
+            self._run()
+
+    def _run(self):
         log_info(f"Iniciando download: {self.chapter.name} - {self.chapter.number}")
         
         try:
@@ -89,6 +97,11 @@ class DownloadWorker(QRunnable):
             try:
                 ch = ProviderDownloadUseCase(self.provider).execute(pages=pages, fn=update_progress_bar)
                 log_success(f"Download concluído: {self.chapter.number}")
+            except CircuitOpenError as e:
+                # Site fora do ar: não apaga o login, só libera a fila
+                log_error(f"Provedor indisponível: {str(e)}")
+                self.signals.download_error.emit(f'{self.chapter.name} \n {self.chapter.number} \n {str(e)}')
+                return
             except ZeroDivisionError as e:
                 log_error(f"ZeroDivisionError no download: {str(e)}")
                 self.signals.download_error.emit(f'{self.chapter.name} \n {self.chapter.number} \n Erro: Nenhuma página encontrada para download - ZeroDivisionError')
@@ -1,16 +1,17 @@
 from PyQt6.QtCore import QRunnable, pyqtSignal, QObject
 from core.config.login_data import delete_login
+from core.__seedwork.infra.log import log
 from core.providers.application.use_cases import ProviderMangaUseCase, ProviderGetChaptersUseCase, ProviderLoginUseCase
 
 
 def log_info(message):
-    print(f"[INFO] {message}")
+    log.info(f"[INFO] {message}")
 
 def log_error(message):
-    print(f"[ERROR] {message}")
+    log.error(f"[ERROR] {message}")
 
 def log_success(message):
-    print(f"[SUCCESS] {message}")
+    log.info(f"[SUCCESS] {message}")
 
 
 class MangaTaskSignals(QObject):
@@ -60,8 +61,8 @@ class MangaTask(QRunnable):
                 self.signal.error.emit(f"Erro geral: {str(e)}")
             except Exception as cleanup_error:
                 log_error(f"Erro no cleanup: {cleanup_error}")
-                print(f"Erro no MangaTask: {e}")
-                print(f"Erro no cleanup: {cleanup_error}")
+                log.error(f"Erro no MangaTask: {e}")
+                log.error(f"Erro no cleanup: {cleanup_error}")
                 try:
                     self.signal.error.emit(f"Erro crítico: {str(e)}")
                 except:
@@ -102,8 +103,8 @@ class ChaptersTask(QRunnable):
                 self.signal.error.emit(f"Erro geral: {str(e)}")
             except Exception as cleanup_error:
                 log_error(f"Erro no cleanup: {cleanup_error}")
-                print(f"Erro no ChaptersTask: {e}")
-                print(f"Erro no cleanup: {cleanup_error}")
+                log.error(f"Erro no ChaptersTask: {e}")
+                log.error(f"Erro no cleanup: {cleanup_error}")
                 try:
                     self.signal.error.emit(f"Erro crítico: {str(e)}")
                 except:
@@ -1 +1,2 @@
-from core.__seedwork.infra.http.http import HttpService as Http
\ No newline at end of file
+from core.__seedwork.infra.http.http import HttpService as Http
+from core.__seedwork.infra.http.http.async_http import AsyncHttpService as AsyncHttp, run_sync
\ No newline at end of file
@@ -3,16 +3,53 @@ import json
 from urllib.parse import urljoin
 
 class Response:
-    def __init__(self, status: int, data: str, content, url):
+    """
+    Keeps the raw body as received. `data`, `text()` and `json()` decode it
+    on first access, so binary payloads such as page images are never
+    turned into a str.
+    """
+
+    def __init__(self, status: int, data: str | None, content, url, headers=None, encoding: str | None = None):
         self.status = status
-        self.data = data
+        self._data = data
         self.content = content
         self.url = url
-    
+        self.headers = headers if headers is not None else {}
+        self.encoding = encoding
+
+    @property
+    def data(self) -> str:
+        if self._data is None:
+            if isinstance(self.content, str):
+                self._data = self.content
+            else:
+                encoding = self.encoding or self._charset() or 'utf-8'
+                self._data = (self.content or b'').decode(encoding, errors='replace')
+        return self._data
+
+    def _header(self, name: str) -> str:
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+        return ''
+
+    def _charset(self) -> str | None:
+        for param in self._header('content-type').split(';')[1:]:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'charset':
+                return value.strip().strip('"')
+        return None
+
+    @property
+    def content_type(self) -> str:
+        return self._header('content-type').split(';')[0].strip().lower()
+
     def text(self):
-        return str(self.content)
+        return self.data
     
     def json(self):
+        if isinstance(self.content, bytes) and self._data is None:
+            return json.loads(self.content)
         return json.loads(self.data)
 
 class Http(ABC):
@@ -23,4 +60,30 @@ class Http(ABC):
     
     @abstractmethod
     def post(url, data=None, json=None, **kwargs) -> Response:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def download_to(url: str, dest, chunk_size: int = 64 * 1024, max_size: int | None = None, progress=None, **kwargs) -> Response:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def needs_browser(url: str) -> bool:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def fetch_many_in_browser(urls: list[str], on_content) -> list[bool]:
+        raise NotImplementedError()
+
+class AsyncHttp(ABC):
+
+    @abstractmethod
+    async def get(url: str, params=None, **kwargs) -> Response:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def post(url, data=None, json=None, **kwargs) -> Response:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def download_to(url: str, dest, chunk_size: int = 64 * 1024, max_size: int | None = None, progress=None, **kwargs) -> Response:
         raise NotImplementedError()
\ No newline at end of file
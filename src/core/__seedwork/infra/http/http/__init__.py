@@ -1,174 +1,399 @@
-import tldextract
-import cloudscraper
+import os
 from time import sleep
 from core.config.login_data import get_login
+from core.__seedwork.infra.log import log, Level
+from core.__seedwork.infra.utils.domain import get_domain, get_host
 from core.__seedwork.infra.http.contract.http import Http, Response
+from core.__seedwork.infra.http.http.session_pool import session_pool
+from core.__seedwork.infra.http.http.rate_limiter import rate_limiter
+from core.__seedwork.infra.http.http.http_cache import http_cache, cache_key
+from core.__seedwork.infra.http.http.single_flight import single_flight, request_key
+from core.__seedwork.infra.http.http.circuit_breaker import circuit_breaker, CircuitState
+from core.__seedwork.infra.http.http.partial import PartialFile
+from core.__seedwork.infra.http.http.bandwidth import bandwidth_shaper, Priority
+from core.__seedwork.infra.http.http.telemetry import telemetry
+from core.__seedwork.infra.http.http.solve_lock import solve_coordinator
+from core.__seedwork.infra.http.http.route_table import route_table, Route, Kind
 from core.config.request_data import get_request, delete_request, insert_request, RequestData
+from core.cloudflare.domain.page_entity import CloudflarePage
 from core.cloudflare.application.use_cases import (
-    IsCloudflareBlockingUseCase, 
+    ClassifyCloudflareUseCase,
     BypassCloudflareUseCase, 
     BypassCloudflareNoCapchaUseCase, 
     BypassCloudflareNoCapchaFeachUseCase, 
-    IsCloudflareBlockingTimeOutUseCase, 
-    IsCloudflareEnableCookies,
-    IsCloudflareBlockingBadGateway,
-    BypassCloudflareNoCapchaPostUseCase,
-    IsCloudflareAttention
+    BypassCloudflareNoCapchaFetchManyUseCase,
+    BypassCloudflareNoCapchaPostUseCase
 )
 
+RESUME_ATTEMPTS = 3
+
+class _NotOk(Exception):
+    """A download answered with a non-2xx status; raised inside the circuit guard so it counts as a failure."""
+    def __init__(self, status: int):
+        self.status = status
+        super().__init__(f"STATUS: {status}")
+
+def _log_circuit(domain: str, state: CircuitState) -> None:
+    color = {CircuitState.OPEN: 'red', CircuitState.HALF_OPEN: '#FFFF00', CircuitState.CLOSED: 'green'}[state]
+    level = Level.WARNING if state == CircuitState.OPEN else Level.INFO
+    log.log(level, f"<stroke style='color:#add8e6;'>[CIRCUIT]:</stroke> <span style='color:{color};'>{state.value}</span> {domain}")
+
+circuit_breaker.add_listener(_log_circuit)
+
+def _log_route(host: str, kind: Kind, route: Route) -> None:
+    log.info(f"<stroke style='color:#add8e6;'>[ROUTE]:</stroke> <span style='color:#add8e6;'>{route.name.lower()}</span> {host} ({kind.value})")
+
+route_table.add_listener(_log_route)
+
 class HttpService(Http):
+
+    @staticmethod
+    def _stored_data(domain: str, headers=None, cookies=None) -> tuple[dict | None, dict | None]:
+        for re in (get_request(domain), get_login(domain)):
+            if re:
+                headers = {**headers, **re.headers} if headers is not None else re.headers
+                cookies = {**cookies, **re.cookies} if cookies is not None else re.cookies
+        return headers, cookies
     
     @staticmethod
-    def get(url: str, params=None, headers=None, cookies=None, timeout=None, **kwargs) -> Response:
+    def get(url: str, params=None, headers=None, cookies=None, timeout=None, refresh=False, **kwargs) -> Response:
+        refresh = refresh or http_cache.bypassed
+        return HttpService._shared_get(url, params, headers, cookies, timeout, refresh, Kind.PAGE, **kwargs)
+
+    @staticmethod
+    def _shared_get(url: str, params, headers, cookies, timeout, refresh, kind: Kind, **kwargs) -> Response:
+        # Workers starting together on one series often ask for the same page at once
+        key = request_key('GET', cache_key(url, params), headers, cookies, refresh=refresh, kind=kind.value, **kwargs)
+        return single_flight.do(key, lambda: HttpService._get(url, params, headers, cookies, timeout, refresh, kind, **kwargs))
+
+    @staticmethod
+    def _get(url: str, params=None, headers=None, cookies=None, timeout=None, refresh=False, kind: Kind = Kind.PAGE, **kwargs) -> Response:
         status = 0
         count = 0
-        extract = tldextract.extract(url)
-        domain = f"{extract.domain}.{extract.suffix}"
-
-        scraper = cloudscraper.create_scraper(    
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'mobile': False
-            }    
-        )
-     
-        while(status not in range(200, 299) and count <= 10):
-            count += 1
-
-            request_data = get_request(domain)
-
-            if request_data:
-                re = request_data
-                if headers is not None:
-                    headers = {**headers, **re.headers}
-                else:
-                    headers = re.headers
-                if cookies is not None:
-                    cookies = {**cookies, **re.cookies}
-                else:
-                    cookies = re.cookies
-            
-            login_data = get_login(domain)
-
-            if login_data:
-                re = login_data
-                if headers is not None:
-                    headers = {**headers, **re.headers}
-                else:
-                    headers = re.headers
-                if cookies is not None:
-                    cookies = {**cookies, **re.cookies}
-                else:
-                    cookies = re.cookies
-
-            response = scraper.get(url, params=params, headers=headers, cookies=cookies, timeout=timeout, **kwargs)
-            status = response.status_code
-
-            if response.status_code == 403:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:red;'>{status}</span> <a href='#'>{url}</a>")
-                if IsCloudflareBlockingUseCase().execute(response.text):
-                        request_data = get_request(domain)
-                        if(request_data):
-                            delete_request(domain)
-                        data = BypassCloudflareUseCase().execute(f'https://{domain}')
-                        if(data.cloudflare_cookie_value):
-                            insert_request(RequestData(domain=domain, headers=data.user_agent, cookies=data.cloudflare_cookie_value))
+        domain = get_domain(url)
+        host = get_host(url)
+        # Images on the download_to fallback queue with the other image bytes
+        priority = Priority.BULK if kind == Kind.BINARY else Priority.METADATA
+
+        key = cache_key(url, params)
+        cached = None if refresh else http_cache.lookup(key)
+        if cached and cached.is_fresh(http_cache.ttl(domain)):
+            return cached.to_response(url)
+        conditional = cached.validators() if cached else {}
+
+        route = route_table.choose(host, kind)
+        if route != Route.HTTP:
+            result = HttpService._routed_get(domain, url, route, kind)
+            if result:
+                return result
+
+        with circuit_breaker.guard(domain), session_pool.session(domain) as scraper:
+            while(status not in range(200, 299) and count <= 10):
+                count += 1
+
+                headers, cookies = HttpService._stored_data(domain, headers, cookies)
+
+                with telemetry.attempt('GET', url, count) as attempt:
+                    with attempt.phase('queue'):
+                        rate_limiter.acquire(domain)
+                    request_headers = {**(headers or {}), **conditional} if conditional else headers
+                    response = attempt.request(lambda: scraper.get(url, params=params, headers=request_headers, cookies=cookies, timeout=timeout, **kwargs))
+                    status = response.status_code
+                    attempt.received(len(response.content))
+                    with attempt.phase('queue'):
+                        bandwidth_shaper.consume(len(response.content), priority)
+
+                    if response.status_code == 403:
+                        attempt.log(Level.WARNING, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:red;'>{status}</span> <a href='#'>{url}</a>")
+                        route_table.record(host, kind, Route.HTTP, False)
+                        page = ClassifyCloudflareUseCase().execute(response.content)
+                        if page == CloudflarePage.CHALLENGE:
+                                # Workers hitting the wall together share one solve
+                                with attempt.phase('bypass'):
+                                    solved, content = solve_coordinator.solve(domain, attempt.event.started_at, lambda: HttpService._solve_challenge(domain, url, attempt, kind))
+                                if not solved:
+                                    attempt.event.bypass = 'shared'
+                                elif content:
+                                    route_table.record(host, kind, Route.BROWSER, True)
+                                    return Response(200, None, content, url)
+                        elif page == CloudflarePage.ENABLE_COOKIES:
+                            attempt.event.bypass = 'no_captcha_fetch'
+                            with attempt.phase('bypass'):
+                                content = BypassCloudflareNoCapchaFeachUseCase().execute(f'https://{domain}', url)
+                            route_table.record(host, kind, Route.FETCH, bool(content))
+                            if content:
+                                return Response(200, None, content, url)
+                        elif kind == Kind.BINARY:
+                            # The no-captcha bypass returns the rendered page, an image has to be fetched from inside it
+                            attempt.event.bypass = 'no_captcha_fetch'
+                            with attempt.phase('bypass'):
+                                content = BypassCloudflareNoCapchaFeachUseCase().execute(f'https://{domain}', url)
+                            route_table.record(host, kind, Route.FETCH, bool(content))
+                            if content:
+                                return Response(200, None, content, url)
+                        else:
+                            attempt.event.bypass = 'no_captcha'
+                            with attempt.phase('bypass'):
+                                content = BypassCloudflareNoCapchaUseCase().execute(url)
+                            if content and ClassifyCloudflareUseCase().execute(content) != CloudflarePage.TIMEOUT:
+                                route_table.record(host, kind, Route.BROWSER, True)
+                                return Response(200, content, content, url)
+                            else:
+                                with attempt.phase('sleep'):
+                                    sleep(30)
+                    elif status not in range(200, 299) and not 403 and not 429:
+                        attempt.log(Level.WARNING, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:red;'>{status}</span> <a href='#'>{url}</a>")
+                        with attempt.phase('sleep'):
+                            sleep(1)
+                    elif status == 429:
+                        attempt.log(Level.WARNING, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:#FFFF00;'>{status}</span> <a href='#'>{url}</a>")
+                        rate_limiter.penalize(domain, response.headers.get('Retry-After'))
+                    elif status == 304 and cached:
+                        attempt.log(Level.INFO, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:green;'>{status}</span> <a href='#'>{url}</a>")
+                        rate_limiter.success(domain)
+                        http_cache.touch(key)
+                        return cached.to_response(url)
+                    elif status == 301 and 'Location' in response.headers or status == 302 and 'Location' in response.headers:
+                        attempt.log(Level.INFO, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:#add8e6;'>{status}</span> <a href='#'>{url}</a>")
+                        location = response.headers['Location']
+                        if(location.startswith('https://')):
+                            new_url = location
                         else:
-                            content = BypassCloudflareNoCapchaUseCase().execute(url)
-                            if content and not IsCloudflareBlockingBadGateway().execute(content):
-                                return Response(200, 'a', content, url)
-                elif IsCloudflareEnableCookies().execute(response.text):
+                            new_url = f'https://{domain}{response.headers['Location']}'
+                        with attempt.phase('queue'):
+                            rate_limiter.acquire(domain)
+                        response = attempt.request(lambda: scraper.get(new_url, params=params, headers=headers, cookies=cookies, timeout=None, **kwargs))
+                        status = response.status_code
+                        attempt.received(len(response.content))
+                        with attempt.phase('queue'):
+                            bandwidth_shaper.consume(len(response.content), priority)
+                    if status in range(200, 299) or status == 404:
+                        attempt.log(Level.INFO, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:green;'>{status}</span> <a href='#'>{url}</a>")
+                        rate_limiter.success(domain)
+                        route_table.record(host, kind, Route.HTTP, True)
+                        result = Response(response.status_code, None, response.content, url, headers=response.headers, encoding=response.encoding)
+                        if http_cache.is_cacheable(result):
+                            http_cache.store(key, domain, result)
+                        return result
+
+            raise Exception(f"Failed to fetch the URL STATUS: {status}")
+
+    @staticmethod
+    def _routed_get(domain: str, url: str, route: Route, kind: Kind) -> Response | None:
+        """GET straight through the browser route that has been working for the host, None when it failed."""
+        with telemetry.attempt('GET', url, 1) as attempt:
+            attempt.event.bypass = f'route_{route.name.lower()}'
+            with attempt.phase('bypass'):
+                if route == Route.FETCH:
                     content = BypassCloudflareNoCapchaFeachUseCase().execute(f'https://{domain}', url)
-                    if content:
-                        return Response(200, 'a', content, url)
                 else:
                     content = BypassCloudflareNoCapchaUseCase().execute(url)
-                    if(not IsCloudflareBlockingTimeOutUseCase().execute(content)):
-                        return Response(200, content, content, url)
-                    else:
-                        sleep(30)
-            elif status not in range(200, 299) and not 403 and not 429:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:red;'>{status}</span> <a href='#'>{url}</a>")
-                sleep(1)
-            elif status == 429:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:#FFFF00;'>{status}</span> <a href='#'>{url}</a>")
-                sleep(60)                
-            elif status == 301 and 'Location' in response.headers or status == 302 and 'Location' in response.headers:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:#add8e6;'>{status}</span> <a href='#'>{url}</a>")
-                location = response.headers['Location']
-                if(location.startswith('https://')):
-                    new_url = location
-                else:
-                    new_url = f'https://{domain}{response.headers['Location']}'
-                response = scraper.get(new_url, params=params, headers=headers, cookies=cookies, timeout=None, **kwargs)
-                status = response.status_code
-            if status in range(200, 299) or status == 404:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:green;'>{status}</span> <a href='#'>{url}</a>")
-                return Response(response.status_code, response.text, response.content, url)
-
-        raise Exception(f"Failed to fetch the URL STATUS: {status}")
+                    if content and ClassifyCloudflareUseCase().execute(content) in (CloudflarePage.TIMEOUT, CloudflarePage.BAD_GATEWAY):
+                        content = None
+            route_table.record(get_host(url), kind, route, bool(content))
+            if not content:
+                return None
+            attempt.event.status = 200
+            attempt.received(len(content))
+            attempt.log(Level.INFO, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:green;'>{route.name.lower()}</span> <a href='#'>{url}</a>")
+        return Response(200, None, content, url)
 
+    @staticmethod
+    def _solve_challenge(domain: str, url: str, attempt, kind: Kind = Kind.PAGE) -> bytes | str | None:
+        """Stores a new clearance for `domain`, or returns the page content when only the no-captcha bypass got through."""
+        request_data = get_request(domain)
+        if(request_data):
+            delete_request(domain)
+        attempt.event.bypass = 'captcha'
+        data = BypassCloudflareUseCase().execute(f'https://{domain}')
+        if(data.cloudflare_cookie_value):
+            insert_request(RequestData(domain=domain, headers=data.user_agent, cookies=data.cloudflare_cookie_value, expires_at=data.expires_at, tls_profile=data.tls_profile))
+            return None
+        if kind == Kind.BINARY:
+            # Only a rendered page would come back, not the file
+            return None
+        attempt.event.bypass = 'no_captcha'
+        content = BypassCloudflareNoCapchaUseCase().execute(url)
+        if content and ClassifyCloudflareUseCase().execute(content) != CloudflarePage.BAD_GATEWAY:
+            return content
+        return None
     
     @staticmethod
     def post(url, data=None, json=None, headers=None, cookies=None, timeout=None, **kwargs) -> Response:
         status = 0
         count = 0
-        extract = tldextract.extract(url)
-        domain = f"{extract.domain}.{extract.suffix}"
-
-        scraper = cloudscraper.create_scraper(    
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'mobile': False
-            }    
-        )
-
-        while(status not in range(200, 299) and count <= 10):
-            count += 1
-
-            request_data = get_request(domain)
-            if(request_data):
-                re = request_data
-                if headers != None: headers = headers | re.headers
-                else: headers = re.headers
-                if cookies != None: cookies = cookies | re.cookies
-                else: cookies = re.cookies
-            
-            login_data = get_login(domain)
-
-            if login_data:
-                re = login_data
-                if headers is not None:
-                    headers = {**headers, **re.headers}
-                else:
-                    headers = re.headers
-                if cookies is not None:
-                    cookies = {**cookies, **re.cookies}
-                else:
-                    cookies = re.cookies
-
-            response = scraper.post(url, data=data, json=json, headers=headers, cookies=cookies, timeout=timeout, **kwargs)
-            status = response.status_code
-
-            if response.status_code == 403:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:#FFFF00;'>{status}</span> <a href='#'>{url}</a>")
-                if IsCloudflareBlockingUseCase().execute(response.text):
-                    data = BypassCloudflareUseCase().execute(f'https://{domain}')
-                    insert_request(RequestData(domain=domain, headers=data.user_agent, cookies=data.cloudflare_cookie_value))
-                elif IsCloudflareEnableCookies().execute(response.text) or IsCloudflareAttention().execute(response.text):
-                    content = BypassCloudflareNoCapchaPostUseCase().execute(f'https://{domain}', url)
-                    if content:
-                        return Response(200, 'a', content, url)
-            elif status not in range(200, 299) and not 403 and not 429:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:red;'>{status}</span> <a href='#'>{url}</a>")
-                sleep(1)
-            elif status == 429:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:#FFFF00;'>{status}</span> <a href='#'>{url}</a>")
-                sleep(60)
-            else:
-                print(f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:green;'>{status}</span> <a href='#'>{url}</a>")
-                return Response(response.status_code, response.text, response.content, url)
-
-        raise Exception("Failed to fetch the URL")
\ No newline at end of file
+        domain = get_domain(url)
+
+        with circuit_breaker.guard(domain), session_pool.session(domain) as scraper:
+            while(status not in range(200, 299) and count <= 10):
+                count += 1
+
+                headers, cookies = HttpService._stored_data(domain, headers, cookies)
+
+                with telemetry.attempt('POST', url, count) as attempt:
+                    with attempt.phase('queue'):
+                        rate_limiter.acquire(domain)
+                    response = attempt.request(lambda: scraper.post(url, data=data, json=json, headers=headers, cookies=cookies, timeout=timeout, **kwargs))
+                    status = response.status_code
+                    attempt.received(len(response.content))
+                    with attempt.phase('queue'):
+                        bandwidth_shaper.consume(len(response.content), Priority.METADATA)
+
+                    if response.status_code == 403:
+                        attempt.log(Level.WARNING, f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:#FFFF00;'>{status}</span> <a href='#'>{url}</a>")
+                        page = ClassifyCloudflareUseCase().execute(response.content)
+                        if page == CloudflarePage.CHALLENGE:
+                            def solve():
+                                data = BypassCloudflareUseCase().execute(f'https://{domain}')
+                                insert_request(RequestData(domain=domain, headers=data.user_agent, cookies=data.cloudflare_cookie_value, expires_at=data.expires_at, tls_profile=data.tls_profile))
+                            attempt.event.bypass = 'captcha'
+                            with attempt.phase('bypass'):
+                                solved, _ = solve_coordinator.solve(domain, attempt.event.started_at, solve)
+                            if not solved:
+                                attempt.event.bypass = 'shared'
+                        elif page in (CloudflarePage.ENABLE_COOKIES, CloudflarePage.ATTENTION):
+                            attempt.event.bypass = 'no_captcha_post'
+                            with attempt.phase('bypass'):
+                                content = BypassCloudflareNoCapchaPostUseCase().execute(f'https://{domain}', url)
+                            if content:
+                                return Response(200, None, content, url)
+                    elif status not in range(200, 299) and not 403 and not 429:
+                        attempt.log(Level.WARNING, f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:red;'>{status}</span> <a href='#'>{url}</a>")
+                        with attempt.phase('sleep'):
+                            sleep(1)
+                    elif status == 429:
+                        attempt.log(Level.WARNING, f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:#FFFF00;'>{status}</span> <a href='#'>{url}</a>")
+                        rate_limiter.penalize(domain, response.headers.get('Retry-After'))
+                    else:
+                        attempt.log(Level.INFO, f"<stroke style='color:#add8e6;'>[REQUEST] POST:</stroke> <span style='color:#add8e6;'>POST</span> <span style='color:green;'>{status}</span> <a href='#'>{url}</a>")
+                        rate_limiter.success(domain)
+                        return Response(response.status_code, None, response.content, url, headers=response.headers, encoding=response.encoding)
+
+            raise Exception("Failed to fetch the URL")
+
+    @staticmethod
+    def download_to(url: str, dest, chunk_size: int = 64 * 1024, max_size: int | None = None, progress=None, params=None, headers=None, cookies=None, timeout=None, **kwargs) -> Response:
+        domain = get_domain(url)
+        headers, cookies = HttpService._stored_data(domain, headers, cookies)
+        # Paths are written through a .part file that survives dropped connections and restarts
+        partial = PartialFile(dest) if isinstance(dest, (str, os.PathLike)) else None
+        host = get_host(url)
+        # Hosts on a browser route go straight to get(), which takes it; a .part file is still resumed over HTTP
+        resumable = partial is not None and partial.size > 0
+        attempts = RESUME_ATTEMPTS if resumable or route_table.choose(host, Kind.BINARY) == Route.HTTP else 0
+
+        for attempt in range(attempts):
+            resume = partial.resume_headers() if partial else {}
+            request_headers = {**(headers or {}), **resume} if resume else headers
+            try:
+                with telemetry.attempt('GET', url, attempt + 1) as event, circuit_breaker.guard(domain), session_pool.session(domain) as scraper:
+                    with event.phase('queue'):
+                        rate_limiter.acquire(domain)
+                    response = event.request(lambda: scraper.get(url, params=params, headers=request_headers, cookies=cookies, timeout=timeout, stream=True, **kwargs))
+                    try:
+                        if response.status_code == 416 and resume:
+                            # The .part file already holds the whole body
+                            stored_headers = partial.headers()
+                            partial.complete()
+                            return Response(200, None, None, url, headers=stored_headers)
+                        if response.status_code not in range(200, 299):
+                            if response.status_code == 403:
+                                route_table.record(host, Kind.BINARY, Route.HTTP, False)
+                            raise _NotOk(response.status_code)
+
+                        file, offset = partial.open(response.status_code, response.headers) if partial else (dest, 0)
+                        if file is None:
+                            partial.discard()
+                            continue
+                        total = response.headers.get('Content-Length')
+                        total = int(total) + offset if total and total.isdigit() else None
+                        if max_size is not None and total is not None and total > max_size:
+                            if partial:
+                                file.close()
+                                partial.discard()
+                            raise Exception(f"Download exceeds {max_size} bytes: {url}")
+                        chunks = event.count(bandwidth_shaper.iter_chunks(response.iter_content(chunk_size)))
+                        with event.phase('transfer'):
+                            if partial:
+                                with file:
+                                    try:
+                                        write_body(file, chunks, offset, total, max_size, progress)
+                                    except Exception as e:
+                                        # Only a dropped connection keeps the .part file for resuming
+                                        if not isinstance(e, OSError):
+                                            file.close()
+                                            partial.discard()
+                                        raise
+                                partial.complete()
+                            else:
+                                write_body(file, chunks, offset, total, max_size, progress)
+                        event.log(Level.INFO, f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:green;'>{response.status_code}</span> <a href='#'>{url}</a>")
+                        rate_limiter.success(domain)
+                        route_table.record(host, Kind.BINARY, Route.HTTP, True)
+                        # The destination holds the whole body, even when it was resumed
+                        return Response(200 if offset else response.status_code, None, None, url, headers=response.headers, encoding=response.encoding)
+                    finally:
+                        response.close()
+            except _NotOk:
+                # Blocked or failing, get() below takes over
+                break
+            except OSError as e:
+                # requests' connection errors are OSErrors too; what arrived is kept for the next attempt
+                if partial is None or attempt == attempts - 1:
+                    raise
+                log.warning(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>GET</span> <span style='color:#FFFF00;'>resuming at {partial.size} bytes</span> <a href='#'>{url}</a> {e}")
+
+        # Blocked or failed: let get() run its retries and Cloudflare fallbacks
+        result = HttpService._shared_get(url, params, headers, cookies, timeout, False, Kind.BINARY, **kwargs)
+        content = result.content.encode() if isinstance(result.content, str) else result.content
+        if max_size is not None and len(content) > max_size:
+            raise Exception(f"Download exceeds {max_size} bytes: {url}")
+        if partial:
+            file, _ = partial.open(200, result.headers)
+            with file:
+                write_body(file, [content], 0, len(content), max_size, progress)
+            partial.complete()
+        else:
+            write_body(dest, [content], 0, len(content), max_size, progress)
+        return Response(result.status, None, None, url, headers=result.headers)
+
+    @staticmethod
+    def needs_browser(url: str) -> bool:
+        return route_table.peek(get_host(url), Kind.BINARY) == Route.FETCH
+
+    @staticmethod
+    def fetch_many_in_browser(urls: list[str], on_content) -> list[bool]:
+        """Fetches `urls` from one page of their domain, handing each body to on_content(index, content) as it arrives."""
+        if not urls:
+            return []
+        domain = get_domain(urls[0])
+        received = 0
+        def deliver(index: int, content: bytes) -> None:
+            nonlocal received
+            received += len(content)
+            on_content(index, content)
+        with telemetry.attempt('GET', urls[0], 1) as attempt:
+            attempt.event.bypass = 'no_captcha_fetch_many'
+            with attempt.phase('bypass'):
+                fetched = BypassCloudflareNoCapchaFetchManyUseCase().execute(f'https://{domain}', urls, deliver)
+            attempt.received(received)
+            attempt.event.status = 200 if any(fetched) else None
+        route_table.record(get_host(urls[0]), Kind.BINARY, Route.FETCH, any(fetched))
+        for url, ok in zip(urls, fetched):
+            color = 'green' if ok else 'red'
+            log.info(f"<stroke style='color:#add8e6;'>[REQUEST]:</stroke> <span style='color:#add8e6;'>FETCH</span> <span style='color:{color};'>{'200' if ok else 'failed'}</span> <a href='#'>{url}</a>")
+        return fetched
+
+def write_body(file, chunks, offset: int, total: int | None, max_size: int | None, progress=None) -> int:
+    """Writes chunks to a binary file object, counting from `offset` bytes already written."""
+    written = offset
+    for chunk in chunks:
+        if not chunk:
+            continue
+        written += len(chunk)
+        if max_size is not None and written > max_size:
+            raise Exception(f"Download exceeds {max_size} bytes")
+        file.write(chunk)
+        if progress is not None:
+            progress(written, total)
+    return written
@@ -0,0 +1,60 @@
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from core.__seedwork.infra.http.http import HttpService
+from core.__seedwork.infra.http.contract.http import AsyncHttp, Response
+
+MAX_IN_FLIGHT = 16
+
+# cloudscraper and the Cloudflare bypasses are blocking, so the engine runs
+# them on a shared executor and keeps the event loop free to await many
+# requests at once. Connections still come from the per-domain session pool.
+_executor = ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT, thread_name_prefix='http')
+
+class AsyncHttpService(AsyncHttp):
+
+    @staticmethod
+    async def _run(fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(_executor, partial(fn, *args, **kwargs))
+
+    @staticmethod
+    async def get(url: str, params=None, headers=None, cookies=None, timeout=None, **kwargs) -> Response:
+        return await AsyncHttpService._run(HttpService.get, url, params=params, headers=headers, cookies=cookies, timeout=timeout, **kwargs)
+
+    @staticmethod
+    async def post(url, data=None, json=None, headers=None, cookies=None, timeout=None, **kwargs) -> Response:
+        return await AsyncHttpService._run(HttpService.post, url, data=data, json=json, headers=headers, cookies=cookies, timeout=timeout, **kwargs)
+
+    @staticmethod
+    async def download_to(url: str, dest, chunk_size: int = 64 * 1024, max_size: int | None = None, progress=None, **kwargs) -> Response:
+        return await AsyncHttpService._run(HttpService.download_to, url, dest, chunk_size=chunk_size, max_size=max_size, progress=progress, **kwargs)
+
+    @staticmethod
+    async def get_many(urls: list[str], limit: int = MAX_IN_FLIGHT, **kwargs) -> list[Response | Exception]:
+        semaphore = asyncio.Semaphore(limit)
+
+        async def fetch(url):
+            async with semaphore:
+                return await AsyncHttpService.get(url, **kwargs)
+
+        return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+    @staticmethod
+    async def download_many(jobs: list[tuple[str, str]], limit: int = MAX_IN_FLIGHT, **kwargs) -> list[Response | Exception]:
+        """Downloads each (url, dest) pair, at most `limit` at once; a failed download is returned as its exception."""
+        semaphore = asyncio.Semaphore(limit)
+
+        async def fetch(url, dest):
+            async with semaphore:
+                return await AsyncHttpService.download_to(url, dest, **kwargs)
+
+        return await asyncio.gather(*(fetch(url, dest) for url, dest in jobs), return_exceptions=True)
+
+def run_sync(coro):
+    """Runs a coroutine from blocking code such as a QRunnable worker."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError('run_sync cannot be called from a running event loop, await the coroutine instead')
@@ -0,0 +1,72 @@
+import threading
+from enum import IntEnum
+from time import monotonic
+
+# How much of a second of budget can be spent at once after the link was idle
+BURST_SECONDS = 0.25
+
+class Priority(IntEnum):
+    METADATA = 0
+    BULK = 1
+
+class BandwidthShaper:
+    """
+    Process-wide bytes-per-second budget shared by every Http transfer.
+    Callers take bytes from one bucket; while a METADATA request (chapter
+    or page lists) is waiting, BULK image bytes hold back so the small
+    requests are not stuck behind the downloads. A rate of 0 is unlimited.
+    """
+
+    def __init__(self, rate: int = 0):
+        self.rate = rate
+        self._tokens = 0.0
+        self._updated = monotonic()
+        self._waiting = {priority: 0 for priority in Priority}
+        self._cond = threading.Condition()
+
+    def set_rate(self, rate: int) -> None:
+        with self._cond:
+            self._refill(monotonic())
+            rate = max(0, int(rate))
+            if rate != self.rate:
+                # Debt run up at the old rate would be paid off at the new one, e.g. minutes at 1 KB/s
+                self._tokens = 0.0
+            self.rate = rate
+            self._cond.notify_all()
+
+    def _burst(self) -> float:
+        return self.rate * BURST_SECONDS
+
+    def _refill(self, now: float) -> None:
+        if self.rate:
+            self._tokens = min(self._burst(), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _ahead(self, priority: Priority) -> bool:
+        return any(self._waiting[p] for p in Priority if p < priority)
+
+    def consume(self, nbytes: int, priority: Priority = Priority.BULK) -> None:
+        """Blocks until `nbytes` fit in the budget. The bucket may go into debt, later callers pay it off."""
+        if nbytes <= 0 or not self.rate:
+            return
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while self.rate:
+                    self._refill(monotonic())
+                    if self._tokens > 0 and not self._ahead(priority):
+                        self._tokens -= nbytes
+                        break
+                    wait = -self._tokens / self.rate if self._tokens <= 0 else None
+                    self._cond.wait(wait if wait is None else max(wait, 0.001))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def iter_chunks(self, chunks, priority: Priority = Priority.BULK):
+        for chunk in chunks:
+            if chunk:
+                self.consume(len(chunk), priority)
+            yield chunk
+
+bandwidth_shaper = BandwidthShaper()
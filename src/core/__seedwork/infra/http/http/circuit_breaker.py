@@ -0,0 +1,118 @@
+import threading
+from enum import Enum
+from time import monotonic
+from contextlib import contextmanager
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    def __init__(self, domain: str, retry_in: float):
+        self.domain = domain
+        self.retry_in = retry_in
+        super().__init__(f"{domain} is unavailable, requests paused for {int(retry_in)}s")
+
+class _Circuit:
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker. After `failure_threshold` consecutive failed
+    requests the domain is opened and calls fail fast with CircuitOpenError.
+    Once `reset_timeout` has passed a single probe request is let through:
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 120):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, fn) -> None:
+        """fn(domain, state) is called whenever a domain changes state."""
+        self._listeners.append(fn)
+
+    def _notify(self, domain: str, state: CircuitState) -> None:
+        for fn in self._listeners:
+            try:
+                fn(domain, state)
+            except Exception:
+                pass
+
+    def state(self, domain: str) -> CircuitState:
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            return circuit.state if circuit else CircuitState.CLOSED
+
+    def states(self) -> dict[str, CircuitState]:
+        with self._lock:
+            return {domain: c.state for domain, c in self._circuits.items() if c.state != CircuitState.CLOSED}
+
+    def retry_in(self, domain: str) -> float:
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            if not circuit or circuit.state == CircuitState.CLOSED:
+                return 0.0
+            return max(0.0, circuit.opened_at + self.reset_timeout - monotonic())
+
+    def before_request(self, domain: str) -> None:
+        changed = False
+        with self._lock:
+            circuit = self._circuits.setdefault(domain, _Circuit())
+            if circuit.state == CircuitState.CLOSED:
+                return
+            retry_in = circuit.opened_at + self.reset_timeout - monotonic()
+            if circuit.state == CircuitState.OPEN and retry_in <= 0:
+                circuit.state = CircuitState.HALF_OPEN
+                changed = True
+            if circuit.state == CircuitState.HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+            else:
+                raise CircuitOpenError(domain, max(retry_in, 0.0))
+        if changed:
+            self._notify(domain, CircuitState.HALF_OPEN)
+
+    def record_success(self, domain: str) -> None:
+        with self._lock:
+            circuit = self._circuits.get(domain)
+            if not circuit:
+                return
+            changed = circuit.state != CircuitState.CLOSED
+            circuit.state = CircuitState.CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+        if changed:
+            self._notify(domain, CircuitState.CLOSED)
+
+    def record_failure(self, domain: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(domain, _Circuit())
+            circuit.failures += 1
+            opened = circuit.state == CircuitState.HALF_OPEN or (
+                circuit.state == CircuitState.CLOSED and circuit.failures >= self.failure_threshold)
+            if opened:
+                circuit.state = CircuitState.OPEN
+                circuit.opened_at = monotonic()
+            circuit.probing = False
+        if opened:
+            self._notify(domain, CircuitState.OPEN)
+
+    @contextmanager
+    def guard(self, domain: str):
+        self.before_request(domain)
+        try:
+            yield
+        except Exception:
+            self.record_failure(domain)
+            raise
+        self.record_success(domain)
+
+circuit_breaker = CircuitBreaker()
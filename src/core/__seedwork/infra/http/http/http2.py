@@ -0,0 +1,102 @@
+import threading
+from core.__seedwork.infra.log import log
+from core.__seedwork.infra.utils.domain import get_domain
+
+# HTTP/2 needs the optional `httpx[http2]` package (`poetry install -E http2`);
+# without it every host keeps using cloudscraper over HTTP/1.1.
+try:
+    import httpx
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+
+_http2_domains = set()
+_warned = False
+_lock = threading.Lock()
+
+def use_http2(host: str) -> None:
+    """Sends every request for the host's domain over one multiplexed HTTP/2 connection."""
+    global _warned
+    with _lock:
+        _http2_domains.add(get_domain(host))
+        if HTTP2_AVAILABLE or _warned:
+            return
+        _warned = True
+    log.warning(f"<stroke style='color:#add8e6;'>[HTTP2]:</stroke> <span style='color:#FFFF00;'>httpx[http2] is not installed, using HTTP/1.1</span> {host}")
+
+def is_http2(domain: str) -> bool:
+    return HTTP2_AVAILABLE and domain in _http2_domains
+
+class Http2Response:
+    """Exposes the parts of a requests.Response that HttpService relies on."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    @property
+    def encoding(self) -> str | None:
+        return self._response.charset_encoding
+
+    def iter_content(self, chunk_size: int = 64 * 1024):
+        return self._response.iter_bytes(chunk_size)
+
+    def close(self) -> None:
+        self._response.close()
+
+class Http2Session:
+    """
+    Thread-safe HTTP/2 client shared by every worker of a domain, so the
+    pages of a chapter are multiplexed over a single connection instead of
+    being lent one session per thread like cloudscraper sessions.
+    """
+    shared = True
+
+    def __init__(self, max_connections: int = 4, prior_knowledge: bool = False):
+        # prior_knowledge speaks HTTP/2 to plain-text servers that cannot negotiate it through TLS ALPN
+        self._client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(max_connections=max_connections, keepalive_expiry=90),
+        )
+
+    def _request(self, method: str, url: str, params=None, headers=None, cookies=None, timeout=None, stream=False, data=None, json=None, **kwargs):
+        # requests-only options (allow_redirects, verify...) have no per-request equivalent here
+        if cookies:
+            headers = {**(headers or {}), 'Cookie': '; '.join(f'{k}={v}' for k, v in cookies.items())}
+        request = self._client.build_request(
+            method, url, params=params, headers=headers, data=data, json=json,
+            timeout=timeout if timeout is not None else 60)
+        response = self._client.send(request, stream=True)
+        if not stream:
+            try:
+                response.read()
+            finally:
+                response.close()
+        return Http2Response(response)
+
+    def get(self, url: str, **kwargs) -> Http2Response:
+        return self._request('GET', url, **kwargs)
+
+    def post(self, url: str, data=None, json=None, **kwargs) -> Http2Response:
+        return self._request('POST', url, data=data, json=json, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
@@ -0,0 +1,147 @@
+import json
+import sqlite3
+import threading
+from time import time
+from pathlib import Path
+from contextlib import contextmanager
+from os import makedirs
+from urllib.parse import urlencode
+from platformdirs import user_cache_dir
+from core.__seedwork.infra.http.contract.http import Response
+from core.__seedwork.infra.utils.domain import get_domain
+
+cache_path = user_cache_dir('RyujinApp')
+db_path = Path(cache_path) / 'http_cache.db'
+makedirs(cache_path, exist_ok=True)
+
+CACHEABLE_TYPES = ('text/', 'application/json', 'application/xml', 'application/atom+xml', 'application/rss+xml')
+MAX_AGE = 30 * 24 * 3600
+
+def cache_key(url: str, params=None) -> str:
+    if not params:
+        return url
+    query = params if isinstance(params, str) else urlencode(params, doseq=True)
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+class CachedResponse:
+    def __init__(self, key: str, status: int, headers: dict, body: bytes, stored_at: float, encoding: str | None = None):
+        self.key = key
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.encoding = encoding
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and time() - self.stored_at < ttl
+
+    def validators(self) -> dict:
+        validators = {}
+        for key, value in self.headers.items():
+            if key.lower() == 'etag':
+                validators['If-None-Match'] = value
+            elif key.lower() == 'last-modified':
+                validators['If-Modified-Since'] = value
+        return validators
+
+    def to_response(self, url: str) -> Response:
+        return Response(self.status, None, self.body, url, headers=self.headers, encoding=self.encoding)
+
+class HttpCache:
+    """
+    On-disk cache for HTML/JSON GET responses. Entries younger than the
+    domain TTL are served directly; older ones are revalidated with
+    If-None-Match/If-Modified-Since and a 304 is answered from disk.
+    """
+
+    def __init__(self, default_ttl: float = 0):
+        self.default_ttl = default_ttl
+        self._ttls = {}
+        self._lock = threading.Lock()
+        self._ready = False
+        # One connection per thread, reused by every lookup on it
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        conn = sqlite3.connect(db_path, timeout=10)
+        with self._lock:
+            if not self._ready:
+                conn.execute('''CREATE TABLE IF NOT EXISTS cache (
+                                key TEXT PRIMARY KEY,
+                                domain TEXT,
+                                status INTEGER,
+                                headers TEXT,
+                                body BLOB,
+                                stored_at REAL
+                              )''')
+                fields = [column[1] for column in conn.execute('PRAGMA table_info(cache)').fetchall()]
+                if 'encoding' not in fields:
+                    conn.execute('ALTER TABLE cache ADD COLUMN encoding TEXT')
+                conn.execute('DELETE FROM cache WHERE stored_at < ?', (time() - MAX_AGE,))
+                conn.commit()
+                self._ready = True
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def bypass(self):
+        """
+        GETs made by this thread inside the block skip the cache, as with
+        get(refresh=True). Only for an explicit force refresh; normal loads
+        are revalidated anyway when the domain TTL is 0.
+        """
+        previous = getattr(self._local, 'bypass', False)
+        self._local.bypass = True
+        try:
+            yield
+        finally:
+            self._local.bypass = previous
+
+    @property
+    def bypassed(self) -> bool:
+        return getattr(self._local, 'bypass', False)
+
+    def set_ttl(self, domain: str, ttl: float) -> None:
+        self._ttls[get_domain(domain)] = ttl
+
+    def ttl(self, domain: str) -> float:
+        return self._ttls.get(domain, self.default_ttl)
+
+    def is_cacheable(self, response: Response) -> bool:
+        content_type = response.content_type
+        return response.status == 200 and any(content_type.startswith(t) for t in CACHEABLE_TYPES)
+
+    def lookup(self, key: str) -> CachedResponse | None:
+        row = self._connect().execute('SELECT key, status, headers, body, stored_at, encoding FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(row[0], row[1], json.loads(row[2]), row[3], row[4], row[5])
+
+    def store(self, key: str, domain: str, response: Response) -> None:
+        headers = dict(response.headers)
+        has_validators = any(k.lower() in ('etag', 'last-modified') for k in headers)
+        if not has_validators and self.ttl(domain) <= 0:
+            return
+        body = response.content.encode() if isinstance(response.content, str) else response.content
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO cache (key, domain, status, headers, body, stored_at, encoding) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                     (key, domain, response.status, json.dumps(headers), body, time(), response.encoding))
+        conn.commit()
+
+    def touch(self, key: str) -> None:
+        conn = self._connect()
+        conn.execute('UPDATE cache SET stored_at = ? WHERE key = ?', (time(), key))
+        conn.commit()
+
+    def clear(self, domain: str | None = None) -> None:
+        conn = self._connect()
+        if domain is None:
+            conn.execute('DELETE FROM cache')
+        else:
+            conn.execute('DELETE FROM cache WHERE domain = ?', (domain,))
+        conn.commit()
+
+http_cache = HttpCache()
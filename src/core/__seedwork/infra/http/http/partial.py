@@ -0,0 +1,87 @@
+import os
+import json
+
+class PartialFile:
+    """
+    Download target that writes into `<path>.part` and keeps the validators
+    of the response in `<path>.part.json`, so an interrupted transfer can
+    continue with `Range` + `If-Range`. The file only appears at `path`
+    once it is complete.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.part = f'{self.path}.part'
+        self.meta = f'{self.path}.part.json'
+
+    @property
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.part)
+        except OSError:
+            return 0
+
+    def _load_meta(self) -> dict:
+        try:
+            with open(self.meta, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _validator(self, meta: dict) -> str | None:
+        etag = meta.get('etag')
+        # Weak ETags are not allowed in If-Range
+        if etag and not etag.startswith('W/'):
+            return etag
+        return meta.get('last_modified')
+
+    def resume_headers(self) -> dict:
+        size = self.size
+        validator = self._validator(self._load_meta())
+        if size and validator:
+            return {'Range': f'bytes={size}-', 'If-Range': validator}
+        return {}
+
+    def headers(self) -> dict:
+        meta = self._load_meta()
+        return {'Content-Type': meta['content_type']} if meta.get('content_type') else {}
+
+    def open(self, status: int, headers) -> tuple:
+        """
+        Returns the file to write the body to and how many bytes are already
+        in it, or (None, 0) for a range response that does not continue the
+        `.part` file, which the caller must discard and request again.
+        """
+        size = self.size
+        if status == 206:
+            meta = self._load_meta()
+            etag = headers.get('ETag')
+            same = not etag or not meta.get('etag') or etag == meta['etag']
+            if size and same and headers.get('Content-Range', '').startswith(f'bytes {size}-'):
+                return open(self.part, 'ab'), size
+            return None, 0
+
+        with open(self.meta, 'w', encoding='utf-8') as file:
+            json.dump({
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'content_type': headers.get('Content-Type'),
+            }, file)
+        return open(self.part, 'wb'), 0
+
+    def complete(self) -> None:
+        os.replace(self.part, self.path)
+        self.discard_meta()
+
+    def discard_meta(self) -> None:
+        try:
+            os.remove(self.meta)
+        except OSError:
+            pass
+
+    def discard(self) -> None:
+        for file in (self.part, self.meta):
+            try:
+                os.remove(file)
+            except OSError:
+                pass
@@ -0,0 +1,95 @@
+import threading
+from time import monotonic, sleep, time
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+MIN_RATE = 0.2
+DEFAULT_RETRY_AFTER = 30
+
+def parse_retry_after(value) -> float | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        # While blocked, updated points at the end of the block so no tokens accrue
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Takes a token and returns how long the caller must wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        ready_at = self.updated + max(0.0, -self.tokens) / self.rate
+        return max(0.0, ready_at - now, self.blocked_until - now)
+
+    def block(self, now: float, delay: float) -> None:
+        self.blocked_until = max(self.blocked_until, now + delay)
+        self.rate = max(MIN_RATE, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, self.blocked_until)
+
+class RateLimiter:
+    """
+    Token bucket per domain shared by every Http call. A 429 pauses the
+    whole domain for Retry-After and halves its rate, successes slowly
+    bring it back, so parallel workers back off together.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            rate, burst = self._limits.get(domain, (self.rate, self.burst))
+            bucket = self._buckets[domain] = TokenBucket(rate, burst)
+        return bucket
+
+    def configure(self, domain: str, rate: float, burst: int) -> None:
+        with self._lock:
+            self._limits[domain] = (rate, burst)
+            self._buckets.pop(domain, None)
+
+    def acquire(self, domain: str) -> None:
+        with self._lock:
+            wait = self._bucket(domain).reserve(monotonic())
+        if wait > 0:
+            sleep(wait)
+
+    def penalize(self, domain: str, retry_after=None) -> float:
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = DEFAULT_RETRY_AFTER
+        with self._lock:
+            self._bucket(domain).block(monotonic(), delay)
+        return delay
+
+    def success(self, domain: str) -> None:
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket and bucket.rate < bucket.max_rate:
+                bucket.rate = min(bucket.max_rate, bucket.rate + MIN_RATE / 2)
+
+rate_limiter = RateLimiter()
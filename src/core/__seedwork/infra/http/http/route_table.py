@@ -0,0 +1,119 @@
+import threading
+from enum import Enum, IntEnum
+from time import monotonic
+
+# How often a host on a browser route lets one request try plain HTTP again
+PROBE_INTERVAL = 10 * 60
+# A probe whose outcome never got recorded (the request raised) is given back after this
+PROBE_WINDOW = 60
+# Consecutive failures before a route is considered broken
+FAILURE_THRESHOLD = 3
+
+class Route(IntEnum):
+    """Ways to GET a URL, cheapest first."""
+    HTTP = 0
+    FETCH = 1
+    BROWSER = 2
+
+class Kind(Enum):
+    PAGE = 'page'
+    # Images and other downloads; the BROWSER route returns rendered HTML, never their bytes
+    BINARY = 'binary'
+
+class _Routes:
+    def __init__(self):
+        # route -> consecutive failures, 0 once it worked
+        self.failures = {}
+        # routes that worked since their last run of failures
+        self.worked = set()
+        self.preferred = Route.HTTP
+        self.probe_started = None
+        self.last_probe = monotonic()
+
+class RouteTable:
+    """
+    Per-host, per-kind record of which GET path has been working. Hosts
+    that only get through a browser bypass are sent straight to the
+    cheapest route that works, skipping the failed cloudscraper request and
+    the page classification. A browser route is only preferred once it
+    has worked, and any route is given up after `failure_threshold`
+    failures in a row. Every `probe_interval` a single request is let
+    through over plain HTTP to see whether the host recovered.
+    """
+
+    def __init__(self, probe_interval: float = PROBE_INTERVAL, probe_window: float = PROBE_WINDOW, failure_threshold: int = FAILURE_THRESHOLD):
+        self.probe_interval = probe_interval
+        self.probe_window = probe_window
+        self.failure_threshold = failure_threshold
+        self._routes = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, fn) -> None:
+        """fn(host, kind, route) is called whenever a preferred route changes."""
+        self._listeners.append(fn)
+
+    def _notify(self, host: str, kind: Kind, route: Route) -> None:
+        for fn in self._listeners:
+            try:
+                fn(host, kind, route)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _allowed(kind: Kind) -> list[Route]:
+        return [r for r in Route if not (kind == Kind.BINARY and r == Route.BROWSER)]
+
+    def _preferred(self, routes: _Routes, kind: Kind) -> Route:
+        if routes.failures.get(Route.HTTP, 0) < self.failure_threshold:
+            return Route.HTTP
+        for route in self._allowed(kind):
+            if route in routes.worked and routes.failures.get(route, 0) < self.failure_threshold:
+                return route
+        return Route.HTTP
+
+    def _probe_due(self, routes: _Routes, now: float) -> bool:
+        if routes.probe_started is not None and now - routes.probe_started < self.probe_window:
+            return False
+        return now - routes.last_probe >= self.probe_interval
+
+    def peek(self, host: str, kind: Kind = Kind.PAGE) -> Route:
+        """What choose() would answer, without taking the probe."""
+        with self._lock:
+            routes = self._routes.get((host, kind))
+            if routes is None or routes.preferred == Route.HTTP or self._probe_due(routes, monotonic()):
+                return Route.HTTP
+            return routes.preferred
+
+    def choose(self, host: str, kind: Kind = Kind.PAGE) -> Route:
+        """The route to use now; when a probe is due exactly one caller gets Route.HTTP."""
+        with self._lock:
+            routes = self._routes.get((host, kind))
+            if routes is None or routes.preferred == Route.HTTP:
+                return Route.HTTP
+            now = monotonic()
+            if self._probe_due(routes, now):
+                routes.probe_started = routes.last_probe = now
+                return Route.HTTP
+            return routes.preferred
+
+    def record(self, host: str, kind: Kind, route: Route, ok: bool) -> None:
+        if route not in self._allowed(kind):
+            return
+        with self._lock:
+            routes = self._routes.setdefault((host, kind), _Routes())
+            routes.failures[route] = 0 if ok else routes.failures.get(route, 0) + 1
+            if ok:
+                routes.worked.add(route)
+            elif routes.failures[route] >= self.failure_threshold:
+                routes.worked.discard(route)
+            if route == Route.HTTP:
+                routes.probe_started = None
+            previous = routes.preferred
+            routes.preferred = self._preferred(routes, kind)
+            if routes.preferred != previous:
+                routes.last_probe = monotonic()
+        if routes.preferred != previous:
+            self._notify(host, kind, routes.preferred)
+
+route_table = RouteTable()
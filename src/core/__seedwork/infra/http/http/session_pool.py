@@ -0,0 +1,132 @@
+import threading
+import cloudscraper
+from time import monotonic
+from contextlib import contextmanager
+from collections import OrderedDict
+from core.config.request_data import get_request
+from core.__seedwork.infra.http.http.http2 import Http2Session, is_http2
+
+BROWSER = {
+    'browser': 'chrome',
+    'platform': 'windows',
+    'mobile': False
+}
+
+class SessionPool:
+    """
+    Keeps cloudscraper sessions alive per domain so consecutive requests
+    reuse the same TCP/TLS connections instead of doing a new handshake.
+    A session is lent to a single thread at a time, except HTTP/2 clients
+    which are shared so their connection can be multiplexed.
+    """
+
+    def __init__(self, max_domains: int = 32, max_per_domain: int = 4, idle_timeout: float = 90):
+        self.max_domains = max_domains
+        self.max_per_domain = max_per_domain
+        self.idle_timeout = idle_timeout
+        self._idle = OrderedDict()
+        self._shared = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _profile(domain: str) -> dict:
+        # Same profile as the browser that got the domain's clearance, so Cloudflare sees one client
+        request_data = get_request(domain)
+        return request_data.tls_profile if request_data and request_data.tls_profile else BROWSER
+
+    def _create(self, profile: dict):
+        scraper = cloudscraper.create_scraper(browser=profile)
+        scraper.tls_profile = profile
+        return scraper
+
+    def _close(self, sessions):
+        for scraper in sessions:
+            try:
+                scraper.close()
+            except Exception:
+                pass
+
+    def _evict_idle(self, now: float) -> list:
+        expired = []
+        for domain in list(self._idle):
+            alive = []
+            for scraper, last_used in self._idle[domain]:
+                if now - last_used > self.idle_timeout:
+                    expired.append(scraper)
+                else:
+                    alive.append((scraper, last_used))
+            if alive:
+                self._idle[domain] = alive
+            else:
+                del self._idle[domain]
+        return expired
+
+    def _shared_session(self, domain: str):
+        with self._lock:
+            session = self._shared.get(domain)
+            if session is None:
+                session = self._shared[domain] = Http2Session()
+            return session
+
+    def acquire(self, domain: str):
+        if is_http2(domain):
+            return self._shared_session(domain)
+        now = monotonic()
+        profile = self._profile(domain)
+        with self._lock:
+            expired = self._evict_idle(now)
+            scraper = None
+            idle = self._idle.get(domain)
+            if idle:
+                scraper, _ = idle.pop()
+                if not idle:
+                    del self._idle[domain]
+            if scraper is not None and scraper.tls_profile != profile:
+                # Made before the browser stored a new profile for the domain
+                expired.append(scraper)
+                scraper = None
+        self._close(expired)
+        return scraper or self._create(profile)
+
+    def release(self, domain: str, scraper) -> None:
+        if getattr(scraper, 'shared', False):
+            return
+        discarded = []
+        with self._lock:
+            idle = self._idle.setdefault(domain, [])
+            self._idle.move_to_end(domain)
+            if len(idle) < self.max_per_domain:
+                idle.append((scraper, monotonic()))
+            else:
+                discarded.append(scraper)
+            while len(self._idle) > self.max_domains:
+                _, sessions = self._idle.popitem(last=False)
+                discarded.extend(s for s, _ in sessions)
+        self._close(discarded)
+
+    def discard(self, scraper) -> None:
+        # Shared HTTP/2 clients are in use by other threads, a failed request does not close them
+        if not getattr(scraper, 'shared', False):
+            self._close([scraper])
+
+    @contextmanager
+    def session(self, domain: str):
+        scraper = self.acquire(domain)
+        try:
+            yield scraper
+        except Exception:
+            # A broken connection should not go back to the pool
+            self.discard(scraper)
+            raise
+        else:
+            self.release(domain, scraper)
+
+    def clear(self) -> None:
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s, _ in idle]
+            sessions.extend(self._shared.values())
+            self._idle.clear()
+            self._shared.clear()
+        self._close(sessions)
+
+session_pool = SessionPool()
@@ -0,0 +1,49 @@
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls: the first caller for a key runs
+    the function, the others wait and get the same result or exception.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+def _freeze(values) -> tuple:
+    return tuple(sorted((str(k), repr(v)) for k, v in values.items())) if values else ()
+
+def request_key(method: str, url: str, headers=None, cookies=None, **kwargs) -> tuple:
+    return (method, url, _freeze(headers), _freeze(cookies), _freeze(kwargs))
+
+single_flight = SingleFlight()
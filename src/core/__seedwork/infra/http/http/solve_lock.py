@@ -0,0 +1,50 @@
+import threading
+from core.__seedwork.infra.log import log
+from core.config.request_data import get_request
+
+# How long a worker waits for another worker's solve before retrying on its own
+SOLVE_WAIT_TIMEOUT = 180
+
+class SolveCoordinator:
+    """
+    Lets only one thread run a Cloudflare solve per domain. Workers that hit
+    the same wall meanwhile wait for it (up to `wait_timeout`) and then retry
+    with the clearance it stored in requests.db, instead of each one
+    deleting the stored request and launching its own browser.
+    """
+
+    def __init__(self, wait_timeout: float = SOLVE_WAIT_TIMEOUT):
+        self.wait_timeout = wait_timeout
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _lock_for(self, domain: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(domain, threading.Lock())
+
+    @staticmethod
+    def cleared_since(domain: str, since: float) -> bool:
+        request_data = get_request(domain)
+        return bool(request_data and request_data.cookies and request_data.issued_at and request_data.issued_at > since)
+
+    def solve(self, domain: str, since: float, fn):
+        """
+        Runs fn() as the domain's solver and returns (True, result). Returns
+        (False, None) without running it when another thread was solving or
+        a clearance newer than `since` (when the blocked request was sent)
+        is already stored; the caller should then just retry its request.
+        """
+        lock = self._lock_for(domain)
+        if not lock.acquire(blocking=False):
+            log.info(f"<stroke style='color:#add8e6;'>[CLOUDFLARE]:</stroke> <span style='color:#FFFF00;'>waiting for the solve in progress</span> {domain}")
+            if lock.acquire(timeout=self.wait_timeout):
+                lock.release()
+            return False, None
+        try:
+            if self.cleared_since(domain, since):
+                return False, None
+            return True, fn()
+        finally:
+            lock.release()
+
+solve_coordinator = SolveCoordinator()
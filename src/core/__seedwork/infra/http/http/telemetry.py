@@ -0,0 +1,186 @@
+import json
+import threading
+from time import perf_counter, time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from core.__seedwork.infra.log import log, Level
+from core.__seedwork.infra.utils.domain import get_hostname
+
+@dataclass
+class RequestEvent:
+    """
+    One network attempt made by HttpService. Timings are in seconds:
+    `queue` is time spent waiting on the rate limiter and bandwidth shaper
+    (including 429 back-offs), `ttfb` is connect + TLS + time until the
+    response headers arrived, `transfer` is reading the body, `bypass` is
+    time spent in a Cloudflare bypass and `sleep` fixed retry pauses.
+    """
+    method: str
+    url: str
+    host: str
+    attempt: int
+    started_at: float
+    status: int | None = None
+    bytes_received: int = 0
+    bytes_sent: int = 0
+    timings: dict = field(default_factory=dict)
+    bypass: str | None = None
+    error: str | None = None
+
+    def as_dict(self):
+        return asdict(self)
+
+class RingBufferSink:
+    def __init__(self, maxlen: int = 1000):
+        self._events = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def events(self, host: str | None = None) -> list[RequestEvent]:
+        with self._lock:
+            return [e for e in self._events if host is None or e.host == host]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+class JsonlSink:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        line = json.dumps(event.as_dict(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(line + '\n')
+
+class GuiLogSink:
+    """
+    Shows the timings in the log window. They are appended to the
+    attempt's own [REQUEST] line, so each attempt still takes one line;
+    attempts that logged nothing get a [TIMING] line of their own.
+    """
+
+    @staticmethod
+    def details(event: RequestEvent) -> str:
+        timings = ' '.join(f'{k}={int(v * 1000)}ms' for k, v in event.timings.items())
+        bypass = f' bypass={event.bypass}' if event.bypass else ''
+        error = f" <span style='color:red;'>{event.error}</span>" if event.error else ''
+        return f"#{event.attempt} {event.bytes_received}B {timings}{bypass}{error}"
+
+    def write(self, event: RequestEvent, lines: list) -> None:
+        if not lines:
+            color = 'green' if event.status and event.status < 400 else 'red'
+            lines = [(Level.INFO, f"<stroke style='color:#add8e6;'>[TIMING]:</stroke> <span style='color:#add8e6;'>{event.method}</span> <span style='color:{color};'>{event.status}</span> {event.host}")]
+        for level, message in lines[:-1]:
+            log.log(level, message)
+        level, message = lines[-1]
+        log.log(level, f"{message} {self.details(event)}")
+
+    def __call__(self, event: RequestEvent) -> None:
+        self.write(event, [])
+
+class Attempt:
+    def __init__(self, method: str, url: str, attempt: int, defer_log: bool = False):
+        self.event = RequestEvent(method, url, get_hostname(url), attempt, time())
+        self._started = perf_counter()
+        self._defer_log = defer_log
+        self.lines = []
+
+    def log(self, level: Level, message: str) -> None:
+        """Logs the attempt's [REQUEST] line; held until the attempt ends when a GuiLogSink adds the timings to it."""
+        if self._defer_log:
+            self.lines.append((level, message))
+        else:
+            log.log(level, message)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.event.timings[phase] = self.event.timings.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, perf_counter() - start)
+
+    def request(self, fn):
+        """Runs the request call, splitting its time into ttfb and transfer."""
+        start = perf_counter()
+        response = fn()
+        total = perf_counter() - start
+        elapsed = getattr(response, 'elapsed', None)
+        ttfb = min(elapsed.total_seconds(), total) if elapsed is not None else total
+        self.add_time('ttfb', ttfb)
+        if total > ttfb:
+            self.add_time('transfer', total - ttfb)
+        self.event.status = response.status_code
+        body = getattr(getattr(response, 'request', None), 'body', None)
+        if isinstance(body, (bytes, str)):
+            self.event.bytes_sent += len(body)
+        return response
+
+    def received(self, nbytes: int) -> None:
+        self.event.bytes_received += nbytes
+
+    def count(self, chunks):
+        """Counts streamed chunks as they arrive, so a dropped transfer still reports its bytes."""
+        for chunk in chunks:
+            self.event.bytes_received += len(chunk)
+            yield chunk
+
+class Telemetry:
+    """Collects a RequestEvent per HttpService attempt and hands it to every sink."""
+
+    def __init__(self):
+        self._sinks = []
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink) -> None:
+        with self._lock:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink) -> None:
+        with self._lock:
+            if sink in self._sinks:
+                self._sinks.remove(sink)
+
+    def _gui_sink(self) -> GuiLogSink | None:
+        return next((s for s in self._sinks if isinstance(s, GuiLogSink)), None)
+
+    def emit(self, event: RequestEvent, lines: list | None = None) -> None:
+        for sink in list(self._sinks):
+            try:
+                if isinstance(sink, GuiLogSink):
+                    sink.write(event, lines or [])
+                else:
+                    sink(event)
+            except Exception:
+                pass
+
+    @contextmanager
+    def attempt(self, method: str, url: str, attempt: int):
+        gui = self._gui_sink()
+        current = Attempt(method, url, attempt, defer_log=gui is not None)
+        try:
+            yield current
+        except Exception as e:
+            current.event.error = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            current.add_time('total', perf_counter() - current._started)
+            self.emit(current.event, current.lines)
+            if current.lines and self._gui_sink() is None:
+                # The sink was removed meanwhile, the held lines are written as they are
+                for level, message in current.lines:
+                    log.log(level, message)
+
+ring_buffer = RingBufferSink()
+telemetry = Telemetry()
+telemetry.add_sink(ring_buffer)
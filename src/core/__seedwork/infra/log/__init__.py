@@ -0,0 +1,133 @@
+import os
+import re
+import sys
+import html
+import atexit
+import threading
+from enum import IntEnum
+from time import time, sleep, strftime, localtime
+from collections import deque
+from typing import NamedTuple
+
+MAX_LINES = 5000
+FLUSH_INTERVAL = 0.2
+
+class Level(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+class LogRecord(NamedTuple):
+    created: float
+    level: Level
+    message: str
+
+def plain_text(message: str) -> str:
+    """The HTML log lines without tags, for consoles and files."""
+    return html.unescape(re.sub(r'<[^>]+>', '', message))
+
+class LogPipeline:
+    """
+    Callers only append to a bounded deque (atomic, no lock and no I/O on
+    the download threads). A background thread drains it every
+    FLUSH_INTERVAL and hands each sink the whole batch; under a burst the
+    oldest records beyond `max_lines` are dropped instead of blocking.
+    """
+
+    def __init__(self, max_lines: int = MAX_LINES, interval: float = FLUSH_INTERVAL, level: Level = Level.INFO):
+        self.level = level
+        self.interval = interval
+        self._buffer = deque(maxlen=max_lines)
+        self._sinks = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def log(self, level: Level, message) -> None:
+        if level >= self.level:
+            self._buffer.append(LogRecord(time(), level, str(message)))
+
+    def debug(self, message) -> None:
+        self.log(Level.DEBUG, message)
+
+    def info(self, message) -> None:
+        self.log(Level.INFO, message)
+
+    def warning(self, message) -> None:
+        self.log(Level.WARNING, message)
+
+    def error(self, message) -> None:
+        self.log(Level.ERROR, message)
+
+    def add_sink(self, sink, level: Level = Level.DEBUG) -> None:
+        """sink(records) receives batches of LogRecord at or above `level`."""
+        with self._lock:
+            self._sinks.append((sink, level))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='log-flush', daemon=True)
+                self._thread.start()
+
+    def remove_sink(self, sink) -> None:
+        with self._lock:
+            self._sinks = [(s, level) for s, level in self._sinks if s is not sink]
+
+    def _run(self) -> None:
+        while True:
+            sleep(self.interval)
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            sinks = list(self._sinks)
+            if not sinks:
+                return
+            records = []
+            while True:
+                try:
+                    records.append(self._buffer.popleft())
+                except IndexError:
+                    break
+        if not records:
+            return
+        for sink, level in sinks:
+            batch = [r for r in records if r.level >= level]
+            if batch:
+                try:
+                    sink(batch)
+                except Exception:
+                    pass
+
+class ConsoleSink:
+    def __call__(self, records: list[LogRecord]) -> None:
+        # The GUI replaces sys.stdout, the original console is still in __stdout__
+        stream = sys.__stdout__
+        if stream is None:
+            return
+        try:
+            stream.write(''.join(f'{plain_text(r.message)}\n' for r in records))
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+class FileSink:
+    """Plain text log that is rotated to `<path>.1` once it grows past `max_bytes`."""
+
+    def __init__(self, path, max_bytes: int = 5 * 1024 * 1024):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+
+    def __call__(self, records: list[LogRecord]) -> None:
+        lines = ''.join(
+            f"{strftime('%Y-%m-%d %H:%M:%S', localtime(r.created))} {r.level.name:<7} {plain_text(r.message)}\n"
+            for r in records)
+        try:
+            if os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, f'{self.path}.1')
+        except OSError:
+            pass
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(lines)
+
+log = LogPipeline()
+log.add_sink(ConsoleSink())
+atexit.register(log.flush)
@@ -0,0 +1,31 @@
+import tldextract
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Only the public suffix snapshot bundled with tldextract is used, so the
+# first lookup never tries to download the list or write a disk cache.
+_extractor = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+def get_hostname(url: str) -> str:
+    if '://' not in url:
+        url = f'//{url}'
+    return (urlsplit(url).hostname or '').lower()
+
+@lru_cache(maxsize=2048)
+def _extract_host(hostname: str):
+    return _extractor(hostname)
+
+def extract(url: str):
+    return _extract_host(get_hostname(url))
+
+def get_domain(url: str) -> str:
+    """Registered domain of a URL or host, e.g. `cdn.site.com.br` -> `site.com.br`."""
+    info = extract(url)
+    return f"{info.domain}.{info.suffix}"
+
+def get_host(url: str) -> str:
+    """Like get_domain but keeps the subdomain when there is one."""
+    info = extract(url)
+    if info.subdomain:
+        return f"{info.subdomain}.{info.domain}.{info.suffix}"
+    return f"{info.domain}.{info.suffix}"
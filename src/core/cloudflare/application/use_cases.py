@@ -1,8 +1,13 @@
 from core.__seedwork.application.use_cases import UseCase
 from core.cloudflare.domain.request_entity import Request
+from core.cloudflare.domain.page_entity import CloudflarePage
 from core.cloudflare.infra.nodriver import Cloudflare
 
 
+class ClassifyCloudflareUseCase(UseCase):
+    def execute(self, html) -> CloudflarePage:
+        return Cloudflare().classify(html)
+
 class IsCloudflareBlockingUseCase(UseCase):
     def execute(self, html: str) -> bool:
         return Cloudflare().is_cloudflare_blocking(html)
@@ -35,6 +40,10 @@ class BypassCloudflareNoCapchaFeachUseCase(UseCase):
     def execute(self, domain: str, url: str, background = False) -> str:
         return Cloudflare().bypass_cloudflare_no_capcha_fetch(domain, url, background)
 
+class BypassCloudflareNoCapchaFetchManyUseCase(UseCase):
+    def execute(self, domain: str, urls: list[str], on_content, background = False) -> list[bool]:
+        return Cloudflare().bypass_cloudflare_no_capcha_fetch_many(domain, urls, on_content, background)
+
 class BypassCloudflareNoCapchaPostUseCase(UseCase):
     def execute(self, domain: str, url: str, background = False) -> str:
         return Cloudflare().bypass_cloudflare_no_capcha_post(domain, url, background)
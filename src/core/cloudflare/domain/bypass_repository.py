@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
 from .request_entity import Request
+from .page_entity import CloudflarePage
 
 class BypassRepository(ABC):
+    @abstractmethod
+    def classify(html) -> CloudflarePage:
+        raise NotImplementedError()
+
     @abstractmethod
     def is_cloudflare_blocking(html: str) -> bool:
         raise NotImplementedError()
@@ -0,0 +1,9 @@
+from enum import Enum
+
+class CloudflarePage(Enum):
+    CHALLENGE = 'challenge'
+    ENABLE_COOKIES = 'enable_cookies'
+    ATTENTION = 'attention'
+    TIMEOUT = 'timeout'
+    BAD_GATEWAY = 'bad_gateway'
+    NONE = 'none'
@@ -5,6 +5,8 @@ from core.__seedwork.domain.entities import Entity
 class Request(Entity):
     user_agent: dict
     cloudflare_cookie_value: dict
+    expires_at: float | None = None
+    tls_profile: dict | None = None
 
     @classmethod
     def from_dict(user_agent: dict, cloudflare_cookie_value: dict):
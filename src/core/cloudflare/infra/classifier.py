@@ -0,0 +1,54 @@
+import re
+import html
+from core.cloudflare.domain.page_entity import CloudflarePage
+
+# <title> and the cookie alert are found by one scan over the body; it stops as soon as both were seen
+_PATTERN = r'<title\b[^>]*>(?P<title>.*?)</title\s*>|(?P<cookie><div\b[^>]*\bid\s*=\s*["\']?cookie-alert\b)'
+_TEXT = re.compile(_PATTERN, re.IGNORECASE | re.DOTALL)
+_BYTES = re.compile(_PATTERN.encode(), re.IGNORECASE | re.DOTALL)
+
+_EMPTY_HEAD = re.compile(r'<head\b[^>]*></head\s*>', re.IGNORECASE)
+
+_CHALLENGE_TITLES = ('Just a moment...', 'Um momento…')
+_ERROR_TITLES = (
+    ('Attention Required! | Cloudflare', CloudflarePage.ATTENTION),
+    ('Gateway time-out', CloudflarePage.TIMEOUT),
+    ('Bad gateway', CloudflarePage.BAD_GATEWAY),
+)
+
+def classify(content) -> CloudflarePage:
+    """Tells which Cloudflare interstitial, if any, a response body is. Accepts str or bytes."""
+    if isinstance(content, str):
+        pattern = _TEXT
+    elif isinstance(content, (bytes, bytearray)):
+        pattern = _BYTES
+    else:
+        return CloudflarePage.NONE
+
+    title = None
+    cookie_alert = False
+    for match in pattern.finditer(content):
+        if match.group('cookie'):
+            cookie_alert = True
+        elif title is None:
+            title = match.group('title')
+        if title is not None and cookie_alert:
+            break
+
+    if isinstance(title, (bytes, bytearray)):
+        title = title.decode('utf-8', errors='replace')
+    title = html.unescape(title.strip()) if title else ''
+
+    if any(marker in title for marker in _CHALLENGE_TITLES):
+        return CloudflarePage.CHALLENGE
+    # The "Attention Required" block page carries the cookie alert too, cookies win like before
+    if cookie_alert:
+        return CloudflarePage.ENABLE_COOKIES
+    for marker, page in _ERROR_TITLES:
+        if marker in title:
+            return page
+    return CloudflarePage.NONE
+
+def has_empty_head(content: str) -> bool:
+    """Pages the browser could not render come back as `<head></head>`."""
+    return bool(_EMPTY_HEAD.search(content))
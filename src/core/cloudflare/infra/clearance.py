@@ -0,0 +1,92 @@
+import threading
+from time import time, sleep
+from contextlib import contextmanager
+from core.__seedwork.infra.log import log
+from core.config.request_data import get_request, RequestData
+from core.__seedwork.infra.utils.domain import get_domain
+from core.cloudflare.infra.nodriver import Cloudflare
+from core.__seedwork.infra.http.http.solve_lock import solve_coordinator
+
+# cf_clearance lifetime is set per site; session cookies are assumed to last this long
+DEFAULT_CLEARANCE_TTL = 30 * 60
+REFRESH_MARGIN = 5 * 60
+CHECK_INTERVAL = 30
+RETRY_DELAY = 5 * 60
+
+def clearance_expires_at(data: RequestData) -> float | None:
+    if not data or not data.cookies or not data.cookies.get('cf_clearance'):
+        return None
+    if data.expires_at:
+        return data.expires_at
+    if data.issued_at:
+        return data.issued_at + DEFAULT_CLEARANCE_TTL
+    return None
+
+class ClearanceRefresher:
+    """
+    Renews cf_clearance for the domains being downloaded shortly before it
+    expires, on a background thread, so workers keep using a valid cookie
+    instead of hitting a 403 and solving the challenge mid-chapter.
+    """
+
+    def __init__(self, refresh, margin: float = REFRESH_MARGIN, interval: float = CHECK_INTERVAL):
+        self.refresh = refresh
+        self.margin = margin
+        self.interval = interval
+        self._active = {}
+        self._retry_at = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @contextmanager
+    def active(self, hosts):
+        """Marks the hosts' domains as in use by a download while the block runs."""
+        domains = {get_domain(host) for host in hosts}
+        with self._lock:
+            for domain in domains:
+                self._active[domain] = self._active.get(domain, 0) + 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='clearance-refresher', daemon=True)
+                self._thread.start()
+        try:
+            yield
+        finally:
+            with self._lock:
+                for domain in domains:
+                    self._active[domain] -= 1
+                    if not self._active[domain]:
+                        del self._active[domain]
+
+    def due(self, now: float) -> list[str]:
+        with self._lock:
+            domains = [d for d in self._active if self._retry_at.get(d, 0) <= now]
+        due = []
+        for domain in domains:
+            expires_at = clearance_expires_at(get_request(domain))
+            if expires_at is not None and expires_at - now <= self.margin:
+                due.append(domain)
+        return due
+
+    def _run(self) -> None:
+        while True:
+            sleep(self.interval)
+            for domain in self.due(time()):
+                try:
+                    refreshed = self.refresh(domain)
+                except Exception as e:
+                    log.error(f"<stroke style='color:#add8e6;'>[CLEARANCE]:</stroke> <span style='color:red;'>{domain}</span> {e}")
+                    refreshed = False
+                if refreshed:
+                    self._retry_at.pop(domain, None)
+                    log.info(f"<stroke style='color:#add8e6;'>[CLEARANCE]:</stroke> <span style='color:green;'>renewed</span> {domain}")
+                else:
+                    # Interactive challenges are left to the 403 path
+                    self._retry_at[domain] = time() + RETRY_DELAY
+
+def _refresh(domain: str) -> bool:
+    # Same per-domain lock as the 403 path, a worker's solve and the renewal never run together
+    since = time()
+    solved, refreshed = solve_coordinator.solve(domain, since, lambda: Cloudflare().refresh_clearance(domain))
+    return refreshed if solved else solve_coordinator.cleared_since(domain, since)
+
+clearance_refresher = ClearanceRefresher(_refresh)
@@ -1,143 +1,162 @@
-import os
-import sys
-import base64
-import tldextract
+import json
+import asyncio
 import nodriver as uc
-from time import sleep
-from bs4 import BeautifulSoup
-from core.config.request_data import RequestData
+from core.__seedwork.infra.log import log
+from core.__seedwork.infra.utils.domain import get_domain
 from core.cloudflare.domain.request_entity import Request
+from core.cloudflare.domain.page_entity import CloudflarePage
+from core.cloudflare.infra.classifier import classify, has_empty_head
 from core.cloudflare.domain.bypass_repository import BypassRepository
-from core.cloudflare.infra.nodriver.chrome import find_chrome_executable
+from core.cloudflare.infra.nodriver.browser_pool import browser_pool
+from core.cloudflare.infra.nodriver.transfer import fetch_bytes
+from core.cloudflare.infra.nodriver.challenge import wait_challenge, ChallengeTimeout
 from core.config.request_data import get_request, delete_request, insert_request, RequestData
 
+FETCH_CONCURRENCY = 6
+
+# User agent, client hints and language exactly as the browser sends them
+FINGERPRINT_JS = '''
+    (async () => {
+        const data = navigator.userAgentData;
+        const headers = {
+            'user-agent': navigator.userAgent,
+            'accept-language': navigator.languages.map((lang, i) => i ? `${lang};q=${Math.max(0.1, 1 - i / 10).toFixed(1)}` : lang).join(','),
+        };
+        if (data) {
+            headers['sec-ch-ua'] = data.brands.map(b => `"${b.brand}";v="${b.version}"`).join(', ');
+            headers['sec-ch-ua-mobile'] = data.mobile ? '?1' : '?0';
+            headers['sec-ch-ua-platform'] = `"${data.platform}"`;
+        }
+        return JSON.stringify({headers, platform: data ? data.platform : navigator.platform, mobile: data ? data.mobile : false});
+    })()
+'''
+
+def tls_profile(platform: str, mobile: bool) -> dict:
+    """The cloudscraper browser profile closest to the Chrome that solved the challenge."""
+    platform = (platform or '').lower()
+    if 'android' in platform:
+        name = 'android'
+    elif platform in ('ios', 'iphone', 'ipad'):
+        name = 'ios'
+    elif 'mac' in platform:
+        name = 'darwin'
+    elif 'linux' in platform:
+        name = 'linux'
+    else:
+        name = 'windows'
+    return {'browser': 'chrome', 'platform': name, 'mobile': bool(mobile), 'desktop': not mobile}
+
 class Cloudflare(BypassRepository):
-    def is_cloudflare_blocking(self, html: str) -> bool:
-        soup = BeautifulSoup(html, 'html.parser')
+    def classify(self, html) -> CloudflarePage:
+        return classify(html)
 
-        title = soup.title.string if soup.title else ""
-        if "Just a moment..." in title:
-            return True
-        
-        if "Um momento…" in title:
-            return True
-        
-        return False
+    def is_cloudflare_blocking(self, html: str) -> bool:
+        return classify(html) == CloudflarePage.CHALLENGE
     
     def is_cloudflare_time_out(self, html: str) -> bool:
-        soup = BeautifulSoup(html, 'html.parser')
-
-        title = soup.title.string if soup.title else ""
-        if "Gateway time-out" in title:
-            return True
-        
-        return False
+        return classify(html) == CloudflarePage.TIMEOUT
     
     def is_cloudflare_bad_gatway(self, html: str) -> bool:
-        soup = BeautifulSoup(html, 'html.parser')
-
-        title = soup.title.string if soup.title else ""
-        if "Bad gateway" in title:
-            return True
-        
-        return False
+        return classify(html) == CloudflarePage.BAD_GATEWAY
     
     def is_cloudflare_attention(self, html: str) -> bool:
-        soup = BeautifulSoup(html, 'html.parser')
-
-        title = soup.title.string if soup.title else ""
-        if "Attention Required! | Cloudflare" in title:
-            return True
-        
-        return False
+        return classify(html) == CloudflarePage.ATTENTION
         
     def is_cloudflare_enable_cookies(self, html: str) -> bool:
-        soup = BeautifulSoup(html, 'html.parser')
+        return classify(html) == CloudflarePage.ENABLE_COOKIES
 
-        alert = soup.select_one('div#cookie-alert')
-        if alert:
-            return True
-        
-        return False
+    async def _clearance(self, browser, domain: str) -> tuple[dict, float | None]:
+        """Every cookie the browser holds for `domain`, none when cf_clearance is not among them."""
+        cookies = {}
+        expires_at = None
+        cleared = False
+        for cookie in await browser.cookies.get_all():
+            if get_domain(cookie.domain.lstrip('.')) != domain:
+                continue
+            cookies[cookie.name] = cookie.value
+            if(cookie.name == 'cf_clearance'):
+                cleared = True
+                # Session cookies report -1
+                expires_at = cookie.expires if cookie.expires and cookie.expires > 0 else None
+        return (cookies if cleared else {}), expires_at
+
+    async def _fingerprint(self, page) -> tuple[dict, dict]:
+        data = json.loads(await page.evaluate(FINGERPRINT_JS, await_promise=True))
+        return data['headers'], tls_profile(data['platform'], data['mobile'])
+
+    async def _profile(self, browser, page, domain: str) -> RequestData:
+        """What HttpService needs to look like this browser on `domain`."""
+        headers, tls = await self._fingerprint(page)
+        cookies, expires_at = await self._clearance(browser, domain)
+        return RequestData(domain=domain, headers=headers, cookies=cookies, expires_at=expires_at, tls_profile=tls)
 
     def bypass_cloudflare(self, url: str) -> Request:
-        headers={}
-        cookies={}
+        profile = RequestData(domain=get_domain(url), headers={}, cookies={})
         async def get_cloudflare_cookie():
-            nonlocal headers, cookies
-            # Adiciona --no-sandbox em sistemas Linux para evitar problemas com root
-            browser_args = []
-            if sys.platform.startswith('linux'):
-                browser_args.append('--no-sandbox')
-            browser = await uc.start(
-                browser_executable_path=find_chrome_executable(),
-                browser_args=browser_args if browser_args else None,
-            )
-            page = await browser.get(url)
-            agent = await page.evaluate('navigator.userAgent')
-            headers = { 'user-agent': agent }
-            while(True):
-                page_content = await page.get_content()
-                if self.is_cloudflare_blocking(page_content):
-                    sleep(1)
-                else:
-                    break
-            cookiesB = await browser.cookies.get_all()
-            for cookie in cookiesB:
-                if(cookie.name == 'cf_clearance'):
-                    cookies = {'cf_clearance': cookie.value}
-            browser.stop()
-        uc.loop().run_until_complete(get_cloudflare_cookie())
-        return Request(user_agent=headers, cloudflare_cookie_value=cookies)
+            nonlocal profile
+            async with browser_pool.tab(url, headless=False) as (browser, page):
+                try:
+                    await wait_challenge(page, until_cookie=True)
+                except ChallengeTimeout as e:
+                    log.warning(f"<stroke style='color:#add8e6;'>[CLOUDFLARE]:</stroke> <span style='color:#FFFF00;'>{e}</span> {url}")
+                    return
+                profile = await self._profile(browser, page, profile.domain)
+        browser_pool.run(get_cloudflare_cookie)
+        return Request(user_agent=profile.headers, cloudflare_cookie_value=profile.cookies, expires_at=profile.expires_at, tls_profile=profile.tls_profile)
     
+    def refresh_clearance(self, domain: str, timeout: float = 60) -> bool:
+        """
+        Renews the stored cf_clearance before it expires: drops the cookie in
+        the domain's pooled browser, reloads and waits for the non-interactive
+        challenge to pass. Gives up after `timeout`, keeping the old cookie.
+        """
+        refreshed = False
+        async def renew():
+            nonlocal refreshed
+            async with browser_pool.tab(f'https://{domain}', headless=False) as (browser, page):
+                for cookie in await browser.cookies.get_all():
+                    if cookie.name == 'cf_clearance':
+                        await page.send(uc.cdp.network.delete_cookies(name=cookie.name, domain=cookie.domain, path=cookie.path))
+                await page.reload()
+                try:
+                    await wait_challenge(page, timeout, until_cookie=True)
+                except ChallengeTimeout:
+                    return
+                profile = await self._profile(browser, page, domain)
+                if profile.cookies:
+                    insert_request(profile)
+                    refreshed = True
+        browser_pool.run(renew)
+        return refreshed
+
     def bypass_cloudflare_no_capcha(self, url: str) -> str:
         content={}
         async def get_cloudflare_cookie():
             nonlocal content
             cloudflare = False
-            extract = tldextract.extract(url)
-            onlydomain = f"{extract.domain}.{extract.suffix}"
-            # Adiciona --no-sandbox em sistemas Linux para evitar problemas com root
-            browser_args = []
-            if sys.platform.startswith('linux'):
-                browser_args.append('--no-sandbox')
-            browser = await uc.start(
-                browser_executable_path=None,
-                browser_args=browser_args if browser_args else None,
-            )
-            page = await browser.get(url)
-            request_data = get_request(onlydomain)
-            if(request_data):
-                re = request_data
-                await page.evaluate(f'document.cookie = "cf_clearance={re.cookies['cf_clearance']}; path=/; max-age=3600; secure; samesite=strict";')
-                await page.reload()
-            while(True):
-                page_content = await page.get_content()
-                soup = BeautifulSoup(page_content, 'html.parser')
-                head = soup.find('head')
-                if self.is_cloudflare_blocking(page_content):
-                    cloudflare = True
-                    sleep(1)
-                elif head and not head.contents:
+            onlydomain = get_domain(url)
+            async with browser_pool.tab(url, headless=False) as (browser, page):
+                request_data = get_request(onlydomain)
+                if(request_data):
+                    re = request_data
+                    await page.evaluate(f'document.cookie = "cf_clearance={re.cookies['cf_clearance']}; path=/; max-age=3600; secure; samesite=strict";')
+                    await page.reload()
+                try:
+                    page_content, cloudflare = await wait_challenge(page)
+                except ChallengeTimeout as e:
+                    log.warning(f"<stroke style='color:#add8e6;'>[CLOUDFLARE]:</stroke> <span style='color:#FFFF00;'>{e}</span> {url}")
+                    content = None
+                    return
+                if has_empty_head(page_content):
                     content = None
-                    break
                 else:
                     if cloudflare:
                         request_data = get_request(onlydomain)
                         if(request_data):
                             delete_request(onlydomain)
-                        agent = await page.evaluate('navigator.userAgent')
-                        headers = { 'user-agent': agent }
-                        cookiesB = await browser.cookies.get_all()
-                        cookies={}
-                        for cookie in cookiesB:
-                            if(cookie.name == 'cf_clearance'):
-                                cookies = {'cf_clearance': cookie.value}
-                        insert_request(RequestData(domain=onlydomain, headers=headers, cookies=cookies))
-                    content = page_content 
-                    break
-            browser.stop()
-        uc.loop().run_until_complete(get_cloudflare_cookie())
+                        insert_request(await self._profile(browser, page, onlydomain))
+                    content = page_content
+        browser_pool.run(get_cloudflare_cookie)
         return content
     
     def bypass_cloudflare_no_capcha_fetch(self, domain: str, url: str, background = False) -> any:
@@ -145,133 +164,94 @@ class Cloudflare(BypassRepository):
         async def get_cloudflare_cookie():
             nonlocal content
             cloudflare = False
-            extract = tldextract.extract(domain)
-            onlydomain = f"{extract.domain}.{extract.suffix}"
-            # Adiciona --no-sandbox em sistemas Linux para evitar problemas com root
-            browser_args = []
-            if sys.platform.startswith('linux'):
-                browser_args.append('--no-sandbox')
-            browser = await uc.start(
-                browser_executable_path=None,
-                headless=background,
-                browser_args=browser_args if browser_args else None,
-            )
-            page = await browser.get(domain)
-            request_data = get_request(onlydomain)
-            if(request_data):
-                re = request_data
-                if(re.cookies):
-                    await page.evaluate(f'document.cookie = "cf_clearance={re.cookies['cf_clearance']}; path=/; max-age=3600; secure; samesite=strict";')
-                    await page.reload()
-                    cloudflare = False
-            while(True):
+            onlydomain = get_domain(domain)
+            async with browser_pool.tab(domain, headless=background) as (browser, page):
+                request_data = get_request(onlydomain)
+                if(request_data):
+                    re = request_data
+                    if(re.cookies):
+                        await page.evaluate(f'document.cookie = "cf_clearance={re.cookies['cf_clearance']}; path=/; max-age=3600; secure; samesite=strict";')
+                        await page.reload()
+                        cloudflare = False
                 try:
-                    page = await browser.get(domain)
-                    page_content = await page.get_content()
-                    soup = BeautifulSoup(page_content, 'html.parser')
-                    head = soup.find('head')
-                    if self.is_cloudflare_blocking(page_content):
-                        cloudflare = True
-                        sleep(1)
-                    elif head and not head.contents:
+                    page_content, cloudflare = await wait_challenge(page)
+                    if has_empty_head(page_content):
                         content = None
-                        break
                     else:
-                        fetch_content = await page.evaluate(f'''
-                            fetch("{url}")''' + '''.then(response => response.arrayBuffer()).then(buffer => {
-                                let binary = '';
-                                let bytes = new Uint8Array(buffer);
-                                let len = bytes.byteLength;
-                                for (let i = 0; i < len; i++) {
-                                    binary += String.fromCharCode(bytes[i]);
-                                }
-                                return btoa(binary);
-                            });
-                        ''', await_promise=True)
+                        content = await fetch_bytes(page, url)
                         if cloudflare:
                             request_data = get_request(onlydomain)
                             if(request_data):
                                 delete_request(onlydomain)
-                            agent = await page.evaluate('navigator.userAgent')
-                            headers = { 'user-agent': agent }
-                            cookiesB = await browser.cookies.get_all()
-                            cookies={}
-                            for cookie in cookiesB:
-                                if(cookie.name == 'cf_clearance'):
-                                    cookies = {'cf_clearance': cookie.value}
-                            insert_request(RequestData(domain=onlydomain, headers=headers, cookies=cookies))
-                        content = base64.b64decode(fetch_content)
-                        break
+                            insert_request(await self._profile(browser, page, onlydomain))
                 except Exception as e:
-                    print(e)
-            browser.stop()
-        uc.loop().run_until_complete(get_cloudflare_cookie())
+                    log.error(e)
+        browser_pool.run(get_cloudflare_cookie)
         return content
 
+    def bypass_cloudflare_no_capcha_fetch_many(self, domain: str, urls: list[str], on_content, background = False, concurrency: int = FETCH_CONCURRENCY) -> list[bool]:
+        """
+        Fetches every URL from inside one page of `domain`, `concurrency` at
+        a time, instead of one browser round per URL. Each body is handed to
+        on_content(index, content) as its batch finishes and not kept, so at
+        most `concurrency` bodies are in memory. Returns which URLs were fetched.
+        """
+        results = [False] * len(urls)
+        async def fetch_all():
+            onlydomain = get_domain(domain)
+            async with browser_pool.tab(domain, headless=background) as (browser, page):
+                try:
+                    page_content, cloudflare = await wait_challenge(page)
+                except ChallengeTimeout as e:
+                    log.warning(f"<stroke style='color:#add8e6;'>[CLOUDFLARE]:</stroke> <span style='color:#FFFF00;'>{e}</span> {domain}")
+                    return
+                if has_empty_head(page_content):
+                    return
+                if cloudflare:
+                    insert_request(await self._profile(browser, page, onlydomain))
+                for start in range(0, len(urls), concurrency):
+                    batch = urls[start:start + concurrency]
+                    contents = await asyncio.gather(*(fetch_bytes(page, url, ok_only=True) for url in batch), return_exceptions=True)
+                    for i, content in enumerate(contents):
+                        if isinstance(content, Exception):
+                            log.error(content)
+                        elif content:
+                            try:
+                                # Writing to disk off the loop, the other tabs keep going
+                                await asyncio.to_thread(on_content, start + i, content)
+                                results[start + i] = True
+                            except Exception as e:
+                                log.error(e)
+                    del contents
+        browser_pool.run(fetch_all)
+        return results
+
     def bypass_cloudflare_no_capcha_post(self, domain: str, url: str, background = False) -> any:
         content={}
         async def get_cloudflare_cookie():
             nonlocal content
             cloudflare = False
-            extract = tldextract.extract(domain)
-            onlydomain = f"{extract.domain}.{extract.suffix}"
-            # Adiciona --no-sandbox em sistemas Linux para evitar problemas com root
-            browser_args = []
-            if sys.platform.startswith('linux'):
-                browser_args.append('--no-sandbox')
-            browser = await uc.start(
-                browser_executable_path=None,
-                headless=background,
-                browser_args=browser_args if browser_args else None,
-            )
-            page = await browser.get(domain)
-            request_data = get_request(onlydomain)
-            if(request_data):
-                re = request_data
-                if(re.cookies):
-                    await page.evaluate(f'document.cookie = "cf_clearance={re.cookies['cf_clearance']}; path=/; max-age=3600; secure; samesite=strict";')
-                    await page.reload()
-                    cloudflare = False
-            while(True):
+            onlydomain = get_domain(domain)
+            async with browser_pool.tab(domain, headless=background) as (browser, page):
+                request_data = get_request(onlydomain)
+                if(request_data):
+                    re = request_data
+                    if(re.cookies):
+                        await page.evaluate(f'document.cookie = "cf_clearance={re.cookies['cf_clearance']}; path=/; max-age=3600; secure; samesite=strict";')
+                        await page.reload()
+                        cloudflare = False
                 try:
-                    page = await browser.get(domain)
-                    page_content = await page.get_content()
-                    soup = BeautifulSoup(page_content, 'html.parser')
-                    head = soup.find('head')
-                    if self.is_cloudflare_blocking(page_content):
-                        cloudflare = True
-                        sleep(1)
-                    elif head and not head.contents:
+                    page_content, cloudflare = await wait_challenge(page)
+                    if has_empty_head(page_content):
                         content = None
-                        break
                     else:
-                        fetch_content = await page.evaluate(f'''
-                            fetch("{url}", {{method: "POST"}})''' + '''.then(response => response.arrayBuffer()).then(buffer => {
-                                let binary = '';
-                                let bytes = new Uint8Array(buffer);
-                                let len = bytes.byteLength;
-                                for (let i = 0; i < len; i++) {
-                                    binary += String.fromCharCode(bytes[i]);
-                                }
-                                return btoa(binary);
-                            });
-                        ''', await_promise=True)
+                        content = await fetch_bytes(page, url, method='POST')
                         if cloudflare:
                             request_data = get_request(onlydomain)
                             if(request_data):
                                 delete_request(onlydomain)
-                            agent = await page.evaluate('navigator.userAgent')
-                            headers = { 'user-agent': agent }
-                            cookiesB = await browser.cookies.get_all()
-                            cookies={}
-                            for cookie in cookiesB:
-                                if(cookie.name == 'cf_clearance'):
-                                    cookies = {'cf_clearance': cookie.value}
-                            insert_request(RequestData(domain=onlydomain, headers=headers, cookies=cookies))
-                        content = base64.b64decode(fetch_content)
-                        break
+                            insert_request(await self._profile(browser, page, onlydomain))
                 except Exception as e:
-                    print(e)
-            browser.stop()
-        uc.loop().run_until_complete(get_cloudflare_cookie())
+                    log.error(e)
+        browser_pool.run(get_cloudflare_cookie)
         return content
\ No newline at end of file
@@ -0,0 +1,176 @@
+import os
+import sys
+import asyncio
+import nodriver as uc
+from time import monotonic
+from contextlib import asynccontextmanager
+from platformdirs import user_cache_dir
+from core.__seedwork.infra.log import log
+from core.__seedwork.infra.utils.domain import get_domain
+from core.cloudflare.infra.nodriver.chrome import find_chrome_executable
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
+
+profiles_path = os.path.join(user_cache_dir('RyujinApp'), 'browsers')
+
+HEALTH_TIMEOUT = 5
+REAP_INTERVAL = 30
+
+class _PooledBrowser:
+    def __init__(self, key: tuple):
+        self.key = key
+        self.browser = None
+        # Set once Chrome started (or failed to); the slot is already taken meanwhile
+        self.ready = asyncio.Event()
+        self.tabs = 0
+        self.last_used = monotonic()
+
+class BrowserPool:
+    """
+    Long-lived Chrome instances for the Cloudflare bypasses, one profile per
+    domain so cf_clearance and the site's cookies survive between calls.
+    Callers borrow a tab instead of cold-starting Chrome; idle browsers are
+    stopped after `idle_timeout` and at most `max_browsers` run at once.
+
+    Browsers are bound to the event loop that started them, so everything
+    runs on the shared browser runtime and `run()` executes bypass coroutines
+    there.
+    """
+
+    def __init__(self, max_browsers: int = 3, idle_timeout: float = 300):
+        self.max_browsers = max_browsers
+        self.idle_timeout = idle_timeout
+        self._browsers = {}
+        self._reaper = None
+        self._changed = None
+
+    def run(self, fn, *args):
+        """Runs the coroutine function `fn(*args)` on the browser runtime and waits for its result."""
+        return browser_runtime.run(self._run(fn, *args))
+
+    async def _run(self, fn, *args):
+        if self._reaper is None:
+            self._reaper = asyncio.ensure_future(self._reap())
+        return await fn(*args)
+
+    async def _start(self, domain: str, headless: bool):
+        # Adiciona --no-sandbox em sistemas Linux para evitar problemas com root
+        browser_args = ['--no-sandbox'] if sys.platform.startswith('linux') else []
+        profile = os.path.join(profiles_path, f"{domain}{'-headless' if headless else ''}")
+        os.makedirs(profile, exist_ok=True)
+        log.info(f"<stroke style='color:#add8e6;'>[BROWSER]:</stroke> <span style='color:green;'>start</span> {domain}")
+        return await uc.start(
+            user_data_dir=profile,
+            headless=headless,
+            browser_executable_path=find_chrome_executable(),
+            browser_args=browser_args or None,
+        )
+
+    async def _healthy(self, browser) -> bool:
+        if browser.stopped:
+            return False
+        try:
+            await asyncio.wait_for(browser.connection.send(uc.cdp.browser.get_version()), HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    def _stop(self, entry: _PooledBrowser) -> None:
+        self._browsers.pop(entry.key, None)
+        log.info(f"<stroke style='color:#add8e6;'>[BROWSER]:</stroke> <span style='color:#FFFF00;'>stop</span> {entry.key[0]}")
+        try:
+            entry.browser.stop()
+        except Exception:
+            pass
+
+    def _evict_idle(self) -> bool:
+        idle = [e for e in self._browsers.values() if e.tabs == 0]
+        if not idle:
+            return False
+        self._stop(min(idle, key=lambda e: e.last_used))
+        return True
+
+    async def _acquire(self, domain: str, headless: bool) -> _PooledBrowser:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        key = (domain, headless)
+        while True:
+            # Only the bookkeeping runs under the lock, starting Chrome and health checks do not
+            starting = False
+            async with self._changed:
+                while True:
+                    entry = self._browsers.get(key)
+                    if entry is not None:
+                        break
+                    if len(self._browsers) < self.max_browsers or self._evict_idle():
+                        entry = self._browsers[key] = _PooledBrowser(key)
+                        starting = True
+                        break
+                    await self._changed.wait()
+                entry.tabs += 1
+                entry.last_used = monotonic()
+
+            if starting:
+                try:
+                    entry.browser = await self._start(domain, headless)
+                except BaseException:
+                    async with self._changed:
+                        if self._browsers.get(key) is entry:
+                            del self._browsers[key]
+                        self._changed.notify_all()
+                    raise
+                finally:
+                    entry.ready.set()
+                return entry
+
+            await entry.ready.wait()
+            if entry.browser is not None and await self._healthy(entry.browser):
+                return entry
+            async with self._changed:
+                entry.tabs -= 1
+                if self._browsers.get(key) is entry:
+                    self._stop(entry)
+                self._changed.notify_all()
+
+    async def _release(self, entry: _PooledBrowser) -> None:
+        async with self._changed:
+            entry.tabs -= 1
+            entry.last_used = monotonic()
+            self._changed.notify_all()
+
+    @asynccontextmanager
+    async def tab(self, url: str, headless: bool = False):
+        """Yields (browser, tab) with `url` opened in a new tab of the domain's browser."""
+        entry = await self._acquire(get_domain(url), headless)
+        page = None
+        try:
+            page = await entry.browser.get(url, new_tab=True)
+            yield entry.browser, page
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            await self._release(entry)
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            if self._changed is None:
+                continue
+            async with self._changed:
+                now = monotonic()
+                for entry in list(self._browsers.values()):
+                    if entry.tabs == 0 and now - entry.last_used > self.idle_timeout:
+                        self._stop(entry)
+                self._changed.notify_all()
+
+    def close(self) -> None:
+        if not self._browsers:
+            return
+        async def stop_all():
+            for entry in list(self._browsers.values()):
+                self._stop(entry)
+        browser_runtime.run(stop_all())
+
+browser_pool = BrowserPool()
@@ -0,0 +1,76 @@
+import asyncio
+import nodriver as uc
+from core.cloudflare.domain.page_entity import CloudflarePage
+from core.cloudflare.infra.classifier import classify
+
+CHALLENGE_TIMEOUT = 120
+# Re-reads the page when no event arrived, for challenges that finish without navigating
+RECHECK_INTERVAL = 5
+
+class ChallengeTimeout(Exception):
+    pass
+
+def _sets_clearance(event) -> bool:
+    for name, value in (event.headers or {}).items():
+        if name.lower() == 'set-cookie' and 'cf_clearance=' in str(value):
+            return True
+    return False
+
+def _remove_handler(page, event_type, handler) -> None:
+    # nodriver 0.29 has add_handler but no remove_handler, the handlers live in a plain dict of lists
+    callbacks = page.handlers.get(event_type)
+    if callbacks and handler in callbacks:
+        callbacks.remove(handler)
+
+async def wait_challenge(page, timeout: float = CHALLENGE_TIMEOUT, until_cookie: bool = False) -> tuple[str | None, bool]:
+    """
+    Waits for the Cloudflare challenge in `page` to pass without polling:
+    the page is re-read only when CDP reports a navigation, a load or a
+    response setting cf_clearance (or every RECHECK_INTERVAL at most).
+    Returns (content, challenged); with `until_cookie` it returns as soon as
+    cf_clearance is set, content is then None. Raises ChallengeTimeout once
+    `timeout` seconds have passed.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    changed = asyncio.Event()
+    cleared = False
+
+    def on_page(event):
+        changed.set()
+
+    def on_response(event):
+        nonlocal cleared
+        if _sets_clearance(event):
+            cleared = True
+            changed.set()
+
+    handlers = (
+        (uc.cdp.page.FrameNavigated, on_page),
+        (uc.cdp.page.LoadEventFired, on_page),
+        (uc.cdp.network.ResponseReceivedExtraInfo, on_response),
+    )
+    for event_type, handler in handlers:
+        page.add_handler(event_type, handler)
+    try:
+        await page.send(uc.cdp.page.enable())
+        await page.send(uc.cdp.network.enable())
+        challenged = False
+        while True:
+            changed.clear()
+            if until_cookie and cleared:
+                return None, challenged
+            content = await page.get_content()
+            if classify(content) != CloudflarePage.CHALLENGE:
+                return content, challenged
+            challenged = True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ChallengeTimeout(f'Cloudflare challenge still up after {timeout}s')
+            try:
+                await asyncio.wait_for(changed.wait(), min(remaining, RECHECK_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        for event_type, handler in handlers:
+            _remove_handler(page, event_type, handler)
@@ -1,5 +1,6 @@
 import os
 import sys
+from core.__seedwork.infra.log import log
 
 def get_posix_candidates() -> list[str]:
     posix_candidates = [
@@ -75,8 +76,8 @@ def find_chrome_executable() -> str | None:
     
     if valid_candidates:
         result = os.path.normpath(min(valid_candidates, key=len))
-        print(f"[CHROME] Found: {result}")
+        log.debug(f"[CHROME] Found: {result}")
         return result
 
-    print("[CHROME] No executable found")
+    log.warning("[CHROME] No executable found")
     return None
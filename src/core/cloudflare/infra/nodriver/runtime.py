@@ -0,0 +1,51 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+class BrowserRuntime:
+    """
+    The one event loop every nodriver coroutine runs on: the Cloudflare
+    bypasses, the browser pool and the providers that log in or run page
+    scripts through Chrome. Browsers and their connections are bound to the
+    loop that started them, so sharing one loop lets work from different
+    threads overlap instead of each thread driving its own loop.
+    """
+
+    def __init__(self, name: str = 'browser-runtime'):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._loop is not None and self._loop.is_running()
+
+    def submit(self, coro) -> Future:
+        """Schedules `coro` on the runtime loop, from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float | None = None):
+        """Runs `coro` on the runtime loop and blocks the calling thread for its result."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            # Esperar aqui travaria o próprio loop
+            raise RuntimeError('BrowserRuntime.run() called from the runtime thread, await the coroutine instead')
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+browser_runtime = BrowserRuntime()
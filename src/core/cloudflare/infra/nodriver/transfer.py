@@ -0,0 +1,45 @@
+import json
+import base64
+import nodriver as uc
+
+# Bytes asked for per IO.read, Chrome may return less
+CHUNK_SIZE = 1024 * 1024
+
+FETCH_BLOB_JS = '''
+    fetch(%s, {method: %s, credentials: "include"})
+        .then(response => %s ? response.blob() : null)
+'''
+
+async def fetch_bytes(page, url: str, method: str = 'GET', ok_only: bool = False) -> bytes | None:
+    """
+    Fetches `url` inside `page` and reads the body back through a CDP IO
+    stream over the resulting Blob, so Chrome encodes it natively chunk by
+    chunk instead of the page building a binary string byte by byte.
+    None when `ok_only` is set and the response was not 2xx.
+    """
+    check = 'response.ok' if ok_only else 'true'
+    remote, error = await page.send(uc.cdp.runtime.evaluate(
+        expression=FETCH_BLOB_JS % (json.dumps(url), json.dumps(method), check),
+        await_promise=True,
+        return_by_value=False,
+    ))
+    if error:
+        raise Exception(f'fetch {url}: {error.exception.description if error.exception else error.text}')
+    if remote.object_id is None:
+        return None
+    try:
+        handle = uc.cdp.io.StreamHandle(f'blob:{await page.send(uc.cdp.io.resolve_blob(remote.object_id))}')
+        try:
+            return await read_stream(page, handle)
+        finally:
+            await page.send(uc.cdp.io.close(handle))
+    finally:
+        await page.send(uc.cdp.runtime.release_object(remote.object_id))
+
+async def read_stream(page, handle, size: int = CHUNK_SIZE) -> bytes:
+    chunks = []
+    while True:
+        encoded, data, eof = await page.send(uc.cdp.io.read(handle, size=size))
+        chunks.append(base64.b64decode(data) if encoded else data.encode('utf-8'))
+        if eof:
+            return b''.join(chunks)
@@ -4,11 +4,16 @@ from os import makedirs
 from platformdirs import user_config_dir
 from dataclasses import dataclass, asdict
 import json
+from copy import deepcopy
+from core.config.memory_cache import MemoryCache
 
 data_path = user_config_dir('RyujinApp')
 db_path = Path(data_path) / 'login.db'
 makedirs(data_path, exist_ok=True)
 
+_cache = MemoryCache(ttl=60)
+_db_ready = False
+
 @dataclass
 class LoginData:
     domain: str
@@ -23,6 +28,9 @@ class LoginData:
         return cls(**data)
 
 def init_db():
+    global _db_ready
+    if _db_ready:
+        return
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute('''CREATE TABLE IF NOT EXISTS login (
@@ -32,6 +40,7 @@ def init_db():
                       )''')
     conn.commit()
     conn.close()
+    _db_ready = True
 
 def insert_login(data: LoginData) -> None:
     init_db()
@@ -41,8 +50,13 @@ def insert_login(data: LoginData) -> None:
                    (data.domain, json.dumps(data.headers), json.dumps(data.cookies)))
     conn.commit()
     conn.close()
+    _cache.invalidate(data.domain)
 
 def get_login(domain: str) -> LoginData | None:
+    # Callers get their own copy so the cached dicts stay untouched
+    return deepcopy(_cache.load(domain, _select_login))
+
+def _select_login(domain: str) -> LoginData | None:
     init_db()
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -73,6 +87,7 @@ def delete_login(domain: str) -> None:
     cursor.execute('DELETE FROM login WHERE domain = ?', (domain,))
     conn.commit()
     conn.close()
+    _cache.invalidate(domain)
 
 def refresh_login_headers(domain: str, new_headers: dict) -> bool:
 
@@ -0,0 +1,47 @@
+import threading
+from time import monotonic
+
+_MISSING = object()
+
+class MemoryCache:
+    """Process-wide TTL cache in front of the sqlite lookups, None results included."""
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._values = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if monotonic() >= expires:
+                del self._values[key]
+                return default
+            return value
+
+    def set(self, key, value, generation: int | None = None) -> None:
+        with self._lock:
+            # A write that happened while the value was being loaded wins
+            if generation is not None and generation != self._generation:
+                return
+            self._values[key] = (value, monotonic() + self.ttl)
+
+    def invalidate(self, key=None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    def load(self, key, loader):
+        value = self.get(key)
+        if value is _MISSING:
+            generation = self._generation
+            value = loader(key)
+            self.set(key, value, generation)
+        return value
@@ -4,16 +4,27 @@ from os import makedirs
 from platformdirs import user_config_dir
 from dataclasses import dataclass, asdict
 import json
+from time import time
+from copy import deepcopy
+from core.config.memory_cache import MemoryCache
 
 data_path = user_config_dir('RyujinApp')
 db_path = Path(data_path) / 'requests.db'
 makedirs(data_path, exist_ok=True)
 
+_cache = MemoryCache(ttl=60)
+_db_ready = False
+
 @dataclass
 class RequestData:
     domain: str
     headers: dict
     cookies: dict
+    # Unix timestamps; expires_at stays None for session cookies
+    issued_at: float | None = None
+    expires_at: float | None = None
+    # cloudscraper `browser` profile matching the browser that got the clearance
+    tls_profile: dict | None = None
 
     def as_dict(self):
         return asdict(self)
@@ -23,6 +34,9 @@ class RequestData:
         return cls(**data)
 
 def init_db():
+    global _db_ready
+    if _db_ready:
+        return
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute('''CREATE TABLE IF NOT EXISTS requests (
@@ -30,28 +44,42 @@ def init_db():
                         headers TEXT,
                         cookies TEXT
                       )''')
+    cursor.execute("PRAGMA table_info(requests)")
+    fields = [column[1] for column in cursor.fetchall()]
+    for field, kind in (('issued_at', 'REAL'), ('expires_at', 'REAL'), ('tls_profile', 'TEXT')):
+        if field not in fields:
+            cursor.execute(f"ALTER TABLE requests ADD COLUMN {field} {kind}")
     conn.commit()
     conn.close()
+    _db_ready = True
 
 def insert_request(data: RequestData) -> None:
     init_db()
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
-    cursor.execute('INSERT OR REPLACE INTO requests (domain, headers, cookies) VALUES (?, ?, ?)',
-                   (data.domain, json.dumps(data.headers), json.dumps(data.cookies)))
+    issued_at = data.issued_at if data.issued_at is not None else time()
+    tls_profile = json.dumps(data.tls_profile) if data.tls_profile else None
+    cursor.execute('INSERT OR REPLACE INTO requests (domain, headers, cookies, issued_at, expires_at, tls_profile) VALUES (?, ?, ?, ?, ?, ?)',
+                   (data.domain, json.dumps(data.headers), json.dumps(data.cookies), issued_at, data.expires_at, tls_profile))
     conn.commit()
     conn.close()
+    _cache.invalidate(data.domain)
 
 def get_request(domain: str) -> RequestData | None:
+    # Callers get their own copy so the cached dicts stay untouched
+    return deepcopy(_cache.load(domain, _select_request))
+
+def _select_request(domain: str) -> RequestData | None:
     init_db()
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM requests WHERE domain = ?', (domain,))
+    cursor.execute('SELECT domain, headers, cookies, issued_at, expires_at, tls_profile FROM requests WHERE domain = ?', (domain,))
     row = cursor.fetchone()
     conn.close()
     if row is None:
         return None
-    return RequestData(domain=row[0], headers=json.loads(row[1]), cookies=json.loads(row[2]))
+    return RequestData(domain=row[0], headers=json.loads(row[1]), cookies=json.loads(row[2]), issued_at=row[3], expires_at=row[4],
+                       tls_profile=json.loads(row[5]) if row[5] else None)
 
 def update_request(domain: str, headers: dict = None, cookies: dict = None) -> None:
     request_data = get_request(domain)
@@ -63,7 +91,7 @@ def update_request(domain: str, headers: dict = None, cookies: dict = None) -> N
     if cookies is None:
         cookies = request_data.cookies
 
-    updated_data = RequestData(domain=domain, headers=headers, cookies=cookies)
+    updated_data = RequestData(domain=domain, headers=headers, cookies=cookies, issued_at=request_data.issued_at, expires_at=request_data.expires_at, tls_profile=request_data.tls_profile)
     insert_request(updated_data)
 
 def delete_request(domain: str) -> None:
@@ -73,3 +101,4 @@ def delete_request(domain: str) -> None:
     cursor.execute('DELETE FROM requests WHERE domain = ?', (domain,))
     conn.commit()
     conn.close()
+    _cache.invalidate(domain)
@@ -1,16 +1,23 @@
 import re
 import os
 import math
+import shutil
 from PIL import Image
-from io import BytesIO
 from core.config.img_conf import get_config
-from core.__seedwork.infra.http import Http
+from core.__seedwork.infra.http import Http, AsyncHttp, run_sync
+from core.__seedwork.infra.log import log
 from core.providers.domain.page_entity import Pages
 from core.download.domain.download_entity import Chapter
 from core.download.domain.download_repository import DownloadRepository
 from core.__seedwork.infra.utils.sanitize_folder import sanitize_folder_name
 Image.MAX_IMAGE_PIXELS = 933120000
 
+MAX_PAGE_SIZE = 512 * 1024 * 1024
+# Pages of a chapter downloaded at once before they are processed in order
+PAGES_IN_FLIGHT = 4
+# Pages a run finished, one file name per line; only left behind when the run was interrupted
+PROGRESS_FILE = '.progress'
+
 class PillowDownloadRepository(DownloadRepository):
 
     def download(self, pages: Pages, fn=None, headers=None, cookies=None, timeout=None) -> Chapter:
@@ -30,8 +37,29 @@ class PillowDownloadRepository(DownloadRepository):
                 fn(100)
             return Chapter(pages.number, files)
         
+        # Only what an interrupted run recorded is skipped, not whatever NNN.* file is in the folder
+        done = _load_progress(path)
+        content_types = {}
         for i, page in enumerate(pages.pages):
-            response = Http.get(page, headers=headers, cookies=cookies, timeout=timeout)
+            # Raw page as downloaded, kept until it is processed so a retry does not fetch it again
+            raw_file = os.path.join(path, ".%03d.download" % page_number)
+            content_type = content_types.pop(page_number, '')
+            if not os.path.exists(raw_file):
+                if page_number in done:
+                    files.append(done[page_number])
+                    if fn != None:
+                        fn(math.ceil((i + 1) * 100 / total_pages))
+                    page_number += 1
+                    continue
+                if Http.needs_browser(page):
+                    # Only the browser gets through: fetch the rest of the chapter in one page
+                    _fetch_in_browser(path, pages.pages[i:], page_number, done)
+                else:
+                    content_types = _prefetch(path, pages.pages[i:i + PAGES_IN_FLIGHT], page_number, done, headers, cookies, timeout)
+                    content_type = content_types.pop(page_number, '')
+                if not os.path.exists(raw_file):
+                    response = Http.download_to(page, raw_file, max_size=MAX_PAGE_SIZE, headers=headers, cookies=cookies, timeout=timeout)
+                    content_type = response.content_type
             
             original_ext = None
             url_lower = page.lower()
@@ -41,7 +69,6 @@ class PillowDownloadRepository(DownloadRepository):
                     break
             
             if not original_ext:
-                content_type = response.headers.get('content-type', '').lower() if hasattr(response, 'headers') else ''
                 ext_map = {
                     'image/jpeg': '.jpg',
                     'image/jpg': '.jpg',
@@ -55,8 +82,9 @@ class PillowDownloadRepository(DownloadRepository):
             
             original_file = os.path.join(path, f"%03d{original_ext}" % page_number)
             
+            processed = False
             try:
-                img = Image.open(BytesIO(response.content))
+                img = Image.open(raw_file)
                 icc = img.info.get('icc_profile')
                 
                 img.save(original_file, quality=100, dpi=(72, 72), icc_profile=icc)
@@ -75,27 +103,93 @@ class PillowDownloadRepository(DownloadRepository):
                         
                     except Exception as convert_error:
                         # Se conversão falhar, manter original
-                        print(f"<stroke style='color:orange;'>[Converting]:</stroke> <span style='color:red;'>Erro ao converter {original_file} para {img_format}: {convert_error}</span>")
-                        print(f"<stroke style='color:yellow;'>[Info]:</stroke> Mantendo imagem original: {original_file}")
+                        log.error(f"<stroke style='color:orange;'>[Converting]:</stroke> <span style='color:red;'>Erro ao converter {original_file} para {img_format}: {convert_error}</span>")
+                        log.info(f"<stroke style='color:yellow;'>[Info]:</stroke> Mantendo imagem original: {original_file}")
                         files.append(original_file)
                 else:
                     files.append(original_file)
+                img.close()
+                processed = True
+                _mark_done(path, files[-1])
                     
             except Exception as e:
-                print(f"<stroke style='color:green;'>[Downloading]:</stroke> <span style='color:red;'>Error ao processar imagem: {e}</span>")
+                log.error(f"<stroke style='color:green;'>[Downloading]:</stroke> <span style='color:red;'>Error ao processar imagem: {e}</span>")
                 try:
-                    with open(original_file, 'wb') as f:
-                        f.write(response.content)
+                    shutil.copyfile(raw_file, original_file)
                     files.append(original_file)
-                    print(f"<stroke style='color:yellow;'>[Info]:</stroke> Imagem salva diretamente: {original_file}")
+                    processed = True
+                    log.info(f"<stroke style='color:yellow;'>[Info]:</stroke> Imagem salva diretamente: {original_file}")
                 except Exception as save_error:
-                    print(f"<stroke style='color:red;'>[Error]:</stroke> Falha ao salvar imagem: {save_error}")
+                    log.error(f"<stroke style='color:red;'>[Error]:</stroke> Falha ao salvar imagem: {save_error}")
+            finally:
+                if processed:
+                    os.remove(raw_file)
 
             if fn != None:
                 fn(math.ceil((i + 1) * 100 / total_pages))
             page_number += 1
 
+        _clear_progress(path)
         if fn != None:
             fn(100)
 
-        return Chapter(pages.number, files)
\ No newline at end of file
+        return Chapter(pages.number, files)
+
+def _load_progress(path: str) -> dict[int, str]:
+    try:
+        with open(os.path.join(path, PROGRESS_FILE), 'r', encoding='utf-8') as file:
+            names = file.read().splitlines()
+    except OSError:
+        return {}
+    done = {}
+    for name in names:
+        number = name.split('.', 1)[0]
+        if number.isdigit() and os.path.isfile(os.path.join(path, name)):
+            done[int(number)] = os.path.join(path, name)
+    return done
+
+def _mark_done(path: str, file: str) -> None:
+    with open(os.path.join(path, PROGRESS_FILE), 'a', encoding='utf-8') as progress:
+        progress.write(os.path.basename(file) + '\n')
+
+def _clear_progress(path: str) -> None:
+    try:
+        os.remove(os.path.join(path, PROGRESS_FILE))
+    except OSError:
+        pass
+
+def _prefetch(path: str, pages: list[str], first_number: int, done: dict[int, str], headers, cookies, timeout) -> dict[int, str]:
+    """
+    Downloads the raw files of the next pages together, returning their
+    content types by page number. A page that failed is left to the
+    download_to call in the loop, which resumes its .part file.
+    """
+    jobs = []
+    for number, page in enumerate(pages, start=first_number):
+        raw_file = os.path.join(path, ".%03d.download" % number)
+        if not os.path.exists(raw_file) and number not in done:
+            jobs.append((number, page, raw_file))
+    if len(jobs) < 2:
+        return {}
+    responses = run_sync(AsyncHttp.download_many([(page, raw_file) for _, page, raw_file in jobs], limit=PAGES_IN_FLIGHT,
+                                                  max_size=MAX_PAGE_SIZE, headers=headers, cookies=cookies, timeout=timeout))
+    return {number: response.content_type for (number, _, _), response in zip(jobs, responses) if not isinstance(response, Exception)}
+
+def _fetch_in_browser(path: str, pages: list[str], first_number: int, done: dict[int, str]) -> None:
+    """Writes the raw files of the pages not downloaded yet, the ones the browser failed are left to download_to."""
+    missing = []
+    for number, page in enumerate(pages, start=first_number):
+        raw_file = os.path.join(path, ".%03d.download" % number)
+        if not os.path.exists(raw_file) and number not in done:
+            missing.append((page, raw_file))
+    if not missing:
+        return
+    def save(index: int, content: bytes) -> None:
+        # Written as each batch arrives instead of holding the whole chapter in memory;
+        # an existing raw file counts as downloaded, so it only appears once complete
+        if len(content) <= MAX_PAGE_SIZE:
+            raw_file = missing[index][1]
+            with open(f'{raw_file}.tmp', 'wb') as file:
+                file.write(content)
+            os.replace(f'{raw_file}.tmp', raw_file)
+    Http.fetch_many_in_browser([page for page, _ in missing], save)
@@ -5,6 +5,7 @@ from PIL import Image
 from pathlib import Path
 from core.config.img_conf import get_config
 from core.download.domain.download_entity import Chapter
+from core.__seedwork.infra.log import log
 from core.__seedwork.infra.utils.sanitize_folder import sanitize_folder_name
 Image.MAX_IMAGE_PIXELS = 933120000
 
@@ -14,7 +15,7 @@ class GroupImages():
         
         # Verifica se há arquivos para agrupar
         if not ch.files or len(ch.files) == 0:
-            print(f"[GroupImages] Nenhum arquivo para agrupar no capítulo {ch.number}")
+            log.info(f"[GroupImages] Nenhum arquivo para agrupar no capítulo {ch.number}")
             if fn:
                 fn(100)
             return
@@ -1,7 +1,7 @@
 import re
 from typing import List
 from bs4 import BeautifulSoup
-from tldextract import extract
+from core.__seedwork.infra.utils.domain import get_host
 from core.__seedwork.infra.http import Http
 from core.providers.infra.template.base import Base
 from core.providers.domain.entities import Chapter, Pages, Manga
@@ -76,11 +76,7 @@ class NineMangasProvider(Base):
         for pg in pages:
             list.append(pg.get('src'))
         for url in urls:
-            extract_info = extract(ch.id)
-            if extract_info.subdomain:
-                domain = f"{extract_info.subdomain}.{extract_info.domain}.{extract_info.suffix}"
-            else:
-                domain = f"{extract_info.domain}.{extract_info.suffix}"
+            domain = get_host(ch.id)
             response = Http.get(f'https://{domain}{url.get('value')}')
             soup = BeautifulSoup(response.content, 'html.parser')
             page_div = soup.select('center')[1]
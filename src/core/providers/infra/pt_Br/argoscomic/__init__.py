@@ -1,36 +1,17 @@
-import time
 import atexit
 import nodriver as uc
-import asyncio
 import threading
 from bs4 import BeautifulSoup
 from typing import List
 from core.providers.domain.entities import Chapter, Pages, Manga
 from core.providers.infra.template.wordpress_etoshore_manga_theme import WordpressEtoshoreMangaTheme
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
 
 _browsers = []
 _lock = threading.Lock()
-_loop = None
-_loop_thread = None
-
-def _get_loop():
-    global _loop, _loop_thread
-    if _loop is None or _loop.is_closed():
-        def run_loop():
-            global _loop
-            _loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(_loop)
-            _loop.run_forever()
-        
-        _loop_thread = threading.Thread(target=run_loop, daemon=True)
-        _loop_thread.start()
-        time.sleep(0.5)  # espera loop iniciar
-    return _loop
 
 def _run_async(coro):
-    loop = _get_loop()
-    future = asyncio.run_coroutine_threadsafe(coro, loop)
-    return future.result(timeout=30)
+    return browser_runtime.run(coro, timeout=30)
 
 async def _create_browser():
     return await uc.start(
@@ -53,7 +34,6 @@ def _return_browser(browser):
             _run_async(browser.stop())
 
 def _cleanup():
-    global _loop
     with _lock:
         if _browsers:
             async def close_all():
@@ -64,9 +44,6 @@ def _cleanup():
             except:
                 pass
             _browsers.clear()
-    
-    if _loop and not _loop.is_closed():
-        _loop.call_soon_threadsafe(_loop.stop)
 
 atexit.register(_cleanup)
 
@@ -223,5 +200,5 @@ class ArgosComicProvider(WordpressEtoshoreMangaTheme):
         with _lock:
             return {
                 "browsers_in_pool": len(_browsers),
-                "loop_running": _loop is not None and _loop.is_running()
+                "loop_running": browser_runtime.is_running()
             }
\ No newline at end of file
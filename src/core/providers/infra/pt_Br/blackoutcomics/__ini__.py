@@ -1,8 +1,9 @@
+import asyncio
 import nodriver as uc
-from time import sleep
 from typing import List
 from bs4 import BeautifulSoup
 from core.__seedwork.infra.http import Http
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
 from core.providers.infra.template.base import Base
 from core.providers.domain.entities import Chapter, Pages, Manga
 from core.config.login_data import insert_login, LoginData, get_login, delete_login
@@ -42,7 +43,7 @@ class BlackoutProvider(Base):
                 while True:
                     html_page = await page.get_content()
                     if self._is_login_page(html_page):
-                        sleep(1)
+                        await asyncio.sleep(1)
                     else:
                         cookies = await browser.cookies.get_all()
                         for cookie in cookies:
@@ -51,7 +52,7 @@ class BlackoutProvider(Base):
                                 break
                         break
                 browser.stop()
-            uc.loop().run_until_complete(getLogin())
+            browser_runtime.run(getLogin())
 
     def getManga(self, link: str) -> Manga:
         response = Http.get(link)
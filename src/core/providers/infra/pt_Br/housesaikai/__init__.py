@@ -95,6 +95,7 @@ class HouseSaikaiProvider(Base):
 
         try:
             import nodriver as uc
+            from core.cloudflare.infra.nodriver.runtime import browser_runtime
         except Exception as e:
             print(f'[{self.name}] nodriver não disponível para login automatizado: {e}')
             return False
@@ -178,10 +179,10 @@ class HouseSaikaiProvider(Base):
                 browser.stop()
 
         try:
-            uc.loop().run_until_complete(do_login(headless=True))
+            browser_runtime.run(do_login(headless=True))
         except Exception as e:
             try:
-                uc.loop().run_until_complete(do_login(headless=False))
+                browser_runtime.run(do_login(headless=False))
             except Exception as e2:
                 print(f'[{self.name}] Falha ao logar via browser: {e2}')
                 return False
@@ -373,6 +374,7 @@ class HouseSaikaiProvider(Base):
     def _load_nuxt_with_browser(self, url: str) -> Optional[Any]:
         try:
             import nodriver as uc
+            from core.cloudflare.infra.nodriver.runtime import browser_runtime
         except Exception:
             return None
 
@@ -418,7 +420,7 @@ class HouseSaikaiProvider(Base):
                 browser.stop()
 
         try:
-            uc.loop().run_until_complete(run())
+            browser_runtime.run(run())
         except Exception:
             return None
 
@@ -461,6 +463,7 @@ class HouseSaikaiProvider(Base):
 
         try:
             import nodriver as uc
+            from core.cloudflare.infra.nodriver.runtime import browser_runtime
         except Exception:
             return []
 
@@ -573,7 +576,7 @@ class HouseSaikaiProvider(Base):
                 browser.stop()
 
         try:
-            uc.loop().run_until_complete(run())
+            browser_runtime.run(run())
         except Exception:
             return []
 
@@ -15,6 +15,7 @@ from core.download.application.use_cases import DownloadUseCase
 from core.providers.infra.template.wordpress_madara import WordPressMadara
 from core.config.login_data import get_login, insert_login, delete_login, LoginData
 from core.cloudflare.infra.nodriver.chrome import find_chrome_executable
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
 
 
 class ManhastroProvider(WordPressMadara):
@@ -170,7 +171,7 @@ class ManhastroProvider(WordPressMadara):
             finally:
                 browser.stop()
 
-        uc.loop().run_until_complete(perform_login())
+        browser_runtime.run(perform_login())
 
     def _request_json(self, endpoint: str) -> dict:
         endpoint = endpoint.lstrip('/')
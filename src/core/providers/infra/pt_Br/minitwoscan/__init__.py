@@ -1,12 +1,13 @@
+import asyncio
 import nodriver as uc
 from typing import List
-from time import sleep
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from core.__seedwork.infra.http import Http
 from core.providers.domain.entities import Chapter
 from core.providers.infra.template.wordpress_madara import WordPressMadara
 from core.cloudflare.application.use_cases import IsCloudflareBlockingUseCase
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
 
 class MiniTwoScanProvider(WordPressMadara):
     name = 'MiniTwo Scan'
@@ -43,7 +44,7 @@ class MiniTwoScanProvider(WordPressMadara):
             while(True):
                 page_content = await page.get_content()
                 if IsCloudflareBlockingUseCase().execute(page_content):
-                    sleep(1)
+                    await asyncio.sleep(1)
                 else:
                     break
             fetch_content = await page.evaluate('''fetch("https://minitwoscan.com/wp-admin/admin-ajax.php", {
@@ -73,7 +74,7 @@ class MiniTwoScanProvider(WordPressMadara):
                 browser.stop()
 
             browser.stop()
-        uc.loop().run_until_complete(get_script_result())
+        browser_runtime.run(get_script_result())
         return content
     
     def getChapters(self, id: str) -> List[Chapter]:
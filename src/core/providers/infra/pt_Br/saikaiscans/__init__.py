@@ -1,10 +1,11 @@
 import json
 import nodriver as uc
-import tldextract
 from typing import List, Iterable
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 from core.__seedwork.infra.http import Http
+from core.__seedwork.infra.utils.domain import get_domain
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
 from core.config.request_data import get_request, insert_request, RequestData
 from core.providers.infra.template.base import Base
 from core.providers.domain.entities import Chapter, Pages, Manga
@@ -35,9 +36,7 @@ class SaikaiScansProvider(Base):
             return
         domain = self.domain[0]
         if source_url:
-            ext = tldextract.extract(source_url)
-            if ext.suffix:
-                domain = f"{ext.domain}.{ext.suffix}"
+            domain = get_domain(source_url)
         insert_request(RequestData(
             domain=domain,
             headers=self.headers,
@@ -70,7 +69,7 @@ class SaikaiScansProvider(Base):
             await page.evaluate(f'{script}')
             content = await page.evaluate(f'JSON.stringify({extract_path})')
             browser.stop()
-        uc.loop().run_until_complete(get_script_result())
+        browser_runtime.run(get_script_result())
         return content
 
     def getChapters(self, id: str) -> List[Chapter]:
@@ -276,7 +275,7 @@ class SaikaiScansProvider(Base):
             finally:
                 browser.stop()
 
-        uc.loop().run_until_complete(get_pages_from_browser())
+        browser_runtime.run(get_pages_from_browser())
 
         if pages_list:
             self._persist_session(ch.id)
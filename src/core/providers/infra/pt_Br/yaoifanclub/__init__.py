@@ -2,6 +2,7 @@ import nodriver as uc
 from typing import List
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from core.cloudflare.infra.nodriver.runtime import browser_runtime
 from core.providers.domain.entities import Chapter
 from core.providers.infra.template.manga_reader_cms import MangaReaderCms
 
@@ -43,7 +44,7 @@ class YaoiFanClubProvider(MangaReaderCms):
 
             content = page_content
             browser.stop()
-        uc.loop().run_until_complete(get_script_result())
+        browser_runtime.run(get_script_result())
         return content
     
     def getChapters(self, id: str) -> List[Chapter]:
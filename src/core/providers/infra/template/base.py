@@ -1,5 +1,7 @@
 from typing import List
 from core.download.application.use_cases import DownloadUseCase
+from core.__seedwork.infra.http.http.http_cache import http_cache
+from core.__seedwork.infra.http.http.http2 import use_http2
 from core.providers.domain.entities import Chapter, Pages, Manga
 from core.providers.domain.provider_repository import ProviderRepository
 
@@ -8,6 +10,20 @@ class Base(ProviderRepository):
     lang = ''
     domain = ['']
     has_login = False
+    # Seconds an HTML/JSON page is served from the disk cache before revalidating
+    cache_ttl = None
+    # Image hosts whose pages should share one multiplexed HTTP/2 connection.
+    # No provider sets it: at the default 3 workers pooled HTTP/1.1 is faster,
+    # HTTP/2 only helps with many requests in flight against one host
+    http2_hosts = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_ttl is not None:
+            for domain in cls.domain:
+                http_cache.set_ttl(domain, cls.cache_ttl)
+        for host in cls.http2_hosts:
+            use_http2(host)
 
     def login() -> None:
         raise NotImplementedError()
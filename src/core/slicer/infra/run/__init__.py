@@ -11,13 +11,14 @@ from core.slicer.infra.detectors import select_detector
 from core.download.domain.download_entity import Chapter
 from core.slicer.infra.utils.constants import WIDTH_ENFORCEMENT
 from core.slicer.infra.services import ImageHandler, ImageManipulator
+from core.__seedwork.infra.log import log
 from core.__seedwork.infra.utils.sanitize_folder import sanitize_folder_name
 
 class SmartStitch():
     def run(self, ch: Chapter, fn = None) -> Chapter:
         # Verifica se há arquivos para processar
         if not ch.files or len(ch.files) == 0:
-            print(f"[SmartStitch] Nenhum arquivo para processar no capítulo {ch.number}")
+            log.info(f"[SmartStitch] Nenhum arquivo para processar no capítulo {ch.number}")
             if fn:
                 fn(100)
             return ch
@@ -0,0 +1,70 @@
+import io
+import threading
+from time import sleep
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+import core.download.infra.pillow as pillow
+from core.__seedwork.infra.http import AsyncHttp, run_sync
+from core.__seedwork.infra.http.http import HttpService
+from core.config.img_conf import Config
+from core.providers.domain.page_entity import Pages
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (32, 32), 'blue').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+PNG = _png()
+
+class Slow(BaseHTTPRequestHandler):
+    """Serves PNG after a pause, recording how many requests were in flight at once."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        with Slow.lock:
+            Slow.active += 1
+            Slow.peak = max(Slow.peak, Slow.active)
+        sleep(0.2)
+        with Slow.lock:
+            Slow.active -= 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(PNG)))
+        self.end_headers()
+        self.wfile.write(PNG)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server(monkeypatch):
+    Slow.active = Slow.peak = 0
+    monkeypatch.setattr(HttpService, '_stored_data', staticmethod(lambda domain, headers=None, cookies=None: (headers, cookies)))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Slow)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+def test_download_many_keeps_several_in_flight(server, tmp_path):
+    jobs = [(f'{server}/{n}', str(tmp_path / str(n))) for n in range(4)]
+
+    responses = run_sync(AsyncHttp.download_many(jobs, limit=4))
+
+    assert [r.status for r in responses] == [200] * 4
+    assert all((tmp_path / str(n)).read_bytes() == PNG for n in range(4))
+    assert Slow.peak > 1
+
+def test_pillow_downloads_pages_together(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(pillow, 'get_config', lambda: Config(img='.png', save=str(tmp_path)))
+    urls = [f'{server}/{n:03d}' for n in range(1, 7)]
+
+    result = pillow.PillowDownloadRepository().download(Pages('1', '1', 'serie', urls))
+
+    chapter = tmp_path / 'serie' / '1'
+    assert result.files == [str(chapter / f'{n:03d}.png') for n in range(1, 7)]
+    assert 1 < Slow.peak <= pillow.PAGES_IN_FLIGHT
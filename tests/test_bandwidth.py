@@ -0,0 +1,15 @@
+from time import monotonic
+
+from core.__seedwork.infra.http.http.bandwidth import BandwidthShaper
+
+def test_rate_change_drops_the_old_debt():
+    shaper = BandwidthShaper(100 * 1024)
+    # Leaves the bucket about 50 s in debt at 100 KB/s
+    shaper.consume(5 * 1024 * 1024)
+    shaper.set_rate(0)
+    shaper.set_rate(1024)
+
+    start = monotonic()
+    shaper.consume(100)
+
+    assert monotonic() - start < 1
@@ -0,0 +1,54 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.__seedwork.infra.http.http as http
+from core.__seedwork.infra.http.http import HttpService
+from core.__seedwork.infra.http.http.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from core.__seedwork.infra.utils.domain import get_domain
+
+class Unavailable(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        Unavailable.hits += 1
+        body = b'Service Unavailable'
+        self.send_response(503)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Unavailable)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+class FallbackCalled(Exception):
+    pass
+
+def test_repeated_503_opens_the_circuit(server, tmp_path, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    monkeypatch.setattr(http, 'circuit_breaker', breaker)
+    monkeypatch.setattr(HttpService, '_stored_data', staticmethod(lambda domain, headers=None, cookies=None: (headers, cookies)))
+    # get() would retry the 503 for a while, only the download_to attempt matters here
+    def fallback(*args, **kwargs):
+        raise FallbackCalled()
+    monkeypatch.setattr(HttpService, '_shared_get', staticmethod(fallback))
+
+    url = f'{server}/001.jpg'
+    domain = get_domain(url)
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(FallbackCalled):
+            HttpService.download_to(url, tmp_path / '001.jpg')
+
+    assert breaker.state(domain) == CircuitState.OPEN
+    hits = Unavailable.hits
+    with pytest.raises(CircuitOpenError):
+        HttpService.download_to(url, tmp_path / '001.jpg')
+    assert Unavailable.hits == hits
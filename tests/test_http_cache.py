@@ -0,0 +1,53 @@
+import sys
+import sqlite3
+import threading
+
+import pytest
+
+from core.__seedwork.infra.http.contract.http import Response
+from core.__seedwork.infra.http.http.http_cache import HttpCache
+
+# The package re-exports the http_cache instance under the module's name
+cache_module = sys.modules[HttpCache.__module__]
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, 'db_path', tmp_path / 'http_cache.db')
+    return HttpCache(default_ttl=60)
+
+def test_stored_encoding_is_restored(cache):
+    body = 'Capítulo 1'.encode('latin-1')
+    cache.store('https://a.com/', 'a.com', Response(200, None, body, 'https://a.com/', headers={'Content-Type': 'text/html'}, encoding='latin-1'))
+
+    response = cache.lookup('https://a.com/').to_response('https://a.com/')
+
+    assert response.encoding == 'latin-1'
+    assert response.data == 'Capítulo 1'
+
+def test_old_table_gets_the_encoding_column(cache):
+    conn = sqlite3.connect(cache_module.db_path)
+    conn.execute('CREATE TABLE cache (key TEXT PRIMARY KEY, domain TEXT, status INTEGER, headers TEXT, body BLOB, stored_at REAL)')
+    conn.execute("INSERT INTO cache VALUES ('k', 'a.com', 200, '{}', x'00', 9e99)")
+    conn.commit()
+    conn.close()
+
+    cached = cache.lookup('k')
+
+    assert cached.body == b'\x00' and cached.encoding is None
+
+def test_one_connection_per_thread(cache):
+    assert cache._connect() is cache._connect()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(cache._connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not cache._connect()
+
+def test_bypass_is_scoped_to_the_thread(cache):
+    seen = []
+    with cache.bypass():
+        thread = threading.Thread(target=lambda: seen.append(cache.bypassed))
+        thread.start()
+        thread.join()
+        assert cache.bypassed
+    assert not cache.bypassed and seen == [False]
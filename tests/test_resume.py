@@ -0,0 +1,125 @@
+import io
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+import core.download.infra.pillow as pillow
+from core.__seedwork.infra.http.http import HttpService
+from core.config.img_conf import Config
+from core.providers.domain.page_entity import Pages
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+PNG = _png()
+
+class Flaky(BaseHTTPRequestHandler):
+    """Serves `body`, dropping the connection halfway through the first full response."""
+    protocol_version = 'HTTP/1.1'
+    body = PNG
+    drop = True
+    ranges = []
+
+    def do_GET(self):
+        start = 0
+        header = self.headers.get('Range')
+        if header and self.headers.get('If-Range') == '"png"':
+            start = int(header.split('=')[1].rstrip('-'))
+        Flaky.ranges.append(start)
+        body = Flaky.body[start:]
+        self.send_response(206 if start else 200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('ETag', '"png"')
+        self.send_header('Content-Length', str(len(body)))
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(Flaky.body) - 1}/{len(Flaky.body)}')
+        self.end_headers()
+        if Flaky.drop and not start:
+            Flaky.drop = False
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server(monkeypatch):
+    Flaky.body = PNG
+    Flaky.drop = True
+    Flaky.ranges = []
+    monkeypatch.setattr(HttpService, '_stored_data', staticmethod(lambda domain, headers=None, cookies=None: (headers, cookies)))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Flaky)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+def test_dropped_connection_resumes_with_range(server, tmp_path):
+    # Larger than a few download_to chunks, so part of it reaches the .part file before the drop
+    Flaky.body = os.urandom(1024 * 1024)
+    dest = tmp_path / '.001.download'
+    HttpService.download_to(f'{server}/001.png', dest)
+
+    assert dest.read_bytes() == Flaky.body
+    assert Flaky.ranges[0] == 0 and Flaky.ranges[1] > 0
+    assert not os.path.exists(f'{dest}.part')
+
+def test_max_size_discards_the_part_file(server, tmp_path):
+    Flaky.drop = False
+    dest = tmp_path / '.001.download'
+    with pytest.raises(Exception, match='exceeds'):
+        HttpService.download_to(f'{server}/001.png', dest, max_size=10)
+
+    assert os.listdir(tmp_path) == []
+
+@pytest.fixture
+def chapter(tmp_path, monkeypatch):
+    monkeypatch.setattr(pillow, 'get_config', lambda: Config(img='.png', save=str(tmp_path)))
+    path = tmp_path / 'serie' / '1'
+    path.mkdir(parents=True)
+    return path
+
+def test_stale_page_without_progress_is_downloaded_again(server, chapter):
+    # Left by an earlier run: the copyfile fallback saved an error page
+    (chapter / '001.png').write_bytes(b'<html>blocked</html>')
+    Flaky.drop = False
+
+    result = pillow.PillowDownloadRepository().download(Pages('1', '1', 'serie', [f'{server}/001.png']))
+
+    assert Flaky.ranges == [0]
+    assert (chapter / '001.png').read_bytes()[:8] == PNG[:8]
+    assert result.files == [str(chapter / '001.png')]
+    assert not (chapter / pillow.PROGRESS_FILE).exists()
+
+def test_interrupted_run_skips_recorded_pages(server, chapter):
+    (chapter / '001.png').write_bytes(PNG)
+    (chapter / pillow.PROGRESS_FILE).write_text('001.png\n')
+    Flaky.drop = False
+
+    pages = Pages('1', '1', 'serie', [f'{server}/001.png', f'{server}/002.png'])
+    result = pillow.PillowDownloadRepository().download(pages)
+
+    assert Flaky.ranges == [0]
+    assert result.files == [str(chapter / '001.png'), str(chapter / '002.png')]
+    assert not (chapter / pillow.PROGRESS_FILE).exists()
+
+def test_browser_pages_appear_only_when_complete(tmp_path, monkeypatch):
+    seen = []
+    def fetch_many(urls, on_content):
+        for index, url in enumerate(urls):
+            on_content(index, PNG)
+            seen.append(sorted(os.listdir(tmp_path)))
+        return [True] * len(urls)
+    monkeypatch.setattr(pillow.Http, 'fetch_many_in_browser', staticmethod(fetch_many))
+
+    pillow._fetch_in_browser(str(tmp_path), ['https://a.com/1.png', 'https://a.com/2.png'], 1, {})
+
+    assert seen == [['.001.download'], ['.001.download', '.002.download']]
+    assert (tmp_path / '.002.download').read_bytes() == PNG
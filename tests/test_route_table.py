@@ -0,0 +1,32 @@
+from core.__seedwork.infra.http.http.route_table import RouteTable, Route, Kind
+
+def blocked(table: RouteTable, host: str, kind: Kind = Kind.PAGE) -> None:
+    for _ in range(table.failure_threshold):
+        table.record(host, kind, Route.HTTP, False)
+
+def test_a_route_that_never_worked_is_not_preferred():
+    table = RouteTable()
+    blocked(table, 'a.com')
+    table.record('a.com', Kind.PAGE, Route.FETCH, False)
+    table.record('a.com', Kind.PAGE, Route.BROWSER, True)
+
+    assert table.choose('a.com') == Route.BROWSER
+
+def test_a_working_route_survives_isolated_failures():
+    table = RouteTable()
+    blocked(table, 'a.com')
+    table.record('a.com', Kind.PAGE, Route.FETCH, True)
+    table.record('a.com', Kind.PAGE, Route.BROWSER, True)
+    table.record('a.com', Kind.PAGE, Route.FETCH, False)
+    assert table.choose('a.com') == Route.FETCH
+
+    for _ in range(table.failure_threshold - 1):
+        table.record('a.com', Kind.PAGE, Route.FETCH, False)
+    assert table.choose('a.com') == Route.BROWSER
+
+def test_binary_never_prefers_the_browser():
+    table = RouteTable()
+    blocked(table, 'a.com', Kind.BINARY)
+    table.record('a.com', Kind.BINARY, Route.BROWSER, True)
+
+    assert table.choose('a.com', Kind.BINARY) == Route.HTTP